@@ -8,8 +8,14 @@
 #
 # HISTORY:
 #       version 1.0     01/08/2020              --- program initial
+#       version 1.1     18/10/2026              --- -q option streams log.entries in a single pass instead of grep/sed plus per-entry re-reads.
+#       version 1.2     18/10/2026              --- sidecar byte offset index of HAR entries, -f/-p/-q seek straight to entries.
+#       version 1.3     18/10/2026              --- -b option, API inventory of many HAR files analysed in parallel.
+#       version 1.4     18/10/2026              --- payload decoded by content type: json, xml, form-urlencoded and base64 encoded bodies.
+#       version 1.5     18/10/2026              --- -t option, converts a HAR file into new_cc_driver/smb_os_sim tc_files.
+#       version 1.6     18/10/2026              --- -s option, per API breakdown of HAR timings (blocked/dns/connect/ssl/send/wait/receive).
 #
-version = 'v1.0'
+version = 'v1.6'
 
 import sys
 import os
@@ -17,19 +23,55 @@ import getopt
 import re
 from lxml import etree
 import json
-from itertools import islice
+import string
+from datetime import datetime
+import base64
+import binascii
+import urlparse
+import csv
+import glob
+import multiprocessing
+import warnings
+import numpy as np
 
-CMD_STR_UAT = """grep -n '"url": "https://uat.starhub.com/sfapi' {0} | grep -v '.js",' | grep -v '.html' | grep -v '.css' | grep -v '.png' | grep -v '.json' | grep -v '.js?' | grep -v 'woff' | grep -v '.gif' | sed -e 's/ts=[0-9a-z]*//' | sed -e 's/[\?\&]\"\,/",/'"""
-CMD_STR_PROD = """grep -n '"url": "https://www.starhub.com/sfapi' {0} | grep -v '.js",' | grep -v '.html' | grep -v '.css' | grep -v '.png' | grep -v '.json' | grep -v '.js?' | grep -v 'woff' | grep -v '.gif' | sed -e 's/ts=[0-9a-z]*//' | sed -e 's/[\?\&]\"\,/",/'"""
-CMD_STR_EBS = """grep -n -E '"url": "https://onlinestore-uat.business.starhub.com/sfapismb|fapismb' {0} | grep -v '.js",' | grep -v '.html' | grep -v '.css' | grep -v '.png' | grep -v '.json' | grep -v '.js?' | grep -v 'woff' | grep -v '.gif' | sed -e 's/ts=[0-9a-z]*//' | sed -e 's/[\?\&]\"\,/",/'"""
+# API url filters per environment, anything looks like a static asset is skipped.
+URL_PATTERN = {
+  'UAT': re.compile(r'^https://uat\.starhub\.com/sfapi'),
+  'PRD': re.compile(r'^https://www\.starhub\.com/sfapi'),
+  'EBS': re.compile(r'^https://onlinestore-uat\.business\.starhub\.com/sfapismb|fapismb'),
+}
+STATIC_PATTERN = re.compile(r'\.js$|\.html|\.css|\.png|\.json|\.js\?|woff|\.gif')
+TS_PATTERN = re.compile(r'ts=[0-9a-z]*')
+ENTRIES_PATTERN = re.compile(r'"entries"\s*:\s*\[')
+SEP_PATTERN = re.compile(r'[\s,]*')
+CHUNK_SIZE = 1024 * 1024 # bytes read from HAR file at a time by the streaming parser
+
+# sidecar index, one line per entry, built on the first scan of a HAR file and reused until the HAR file changes.
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 'v2'
+INDEX_FIELDS = ["number", "offset", "length", "method", "url", "status", "size", "time",
+                "blocked", "dns", "connect", "ssl", "send", "wait", "receive"]
+TIMINGS = ["blocked", "dns", "connect", "ssl", "send", "wait", "receive"]
+PHASES = ["time"] + TIMINGS + ["size"] # metrics reported by -s option
+PERCENTILES = [50, 90, 99]
+
+# probe values fed into drivers' get_res_n_met/get_payload tables to locate where each TC param lands in the url.
+# param i is probed as HP<i>S0:HP<i>S1:..., so both a whole param and a ':' delimited sub field can be told apart.
+PROBE_PARAMS = 8
+PROBE_FIELDS = 5
+PROBE_PATTERN = re.compile(r'HP(\d)S0(?::HP\1S\d)*|HP(\d)S(\d)', re.I)
+DRIVERS = ['new_cc_driver', 'smb_os_sim']
 
 def usage(arg):
   out_string = '''
 A tool used to extract APIs from a given HAR file.
 
 Usage  1: {0} -e env -f file
-Usage  2: {0} [-h] -p file start end
+Usage  2: {0} [-h] -p file start [end]
 Usage  3: {0} [-h] -e env -q file
+Usage  4: {0} -e env [-j procs] -b path
+Usage  5: {0} -e env -t file
+Usage  6: {0} -e env -s file
 
 where
        -e: specify the environment the har file dumped from.
@@ -38,53 +80,45 @@ where
        -p: instruct program to extract the details of an API.
        -h: optional flag used together with -p option to instruct program to extract API's headers along with rest of the details.
        -q: instruct program to extract the details of all APIs cintained in HAR file.
+       -b: instruct program to build an API inventory (method + url) out of many HAR files, with counts per file.
+           a HAR file which can't be read, e.g. truncated, is reported on stderr and left out of the inventory.
+     path: a directory of *.har files or a quoted glob pattern, e.g. 'release_12/*.har'
+       -j: optional number of worker processes used by -b option, default to number of cores.
+       -t: instruct program to convert the APIs of a HAR file into replayable tc_files, i.e. file.new_cc_driver.tc for new_cc_driver.py -f
+           and file.smb_os_sim.tc for smb_os_sim.py -f. The gap to previous request is set as +a pacing time, which the driver sleeps
+           before each line in single thread -f mode, i.e. original order and gaps are replayed. With -M each line loops on its own
+           thread instead, the gap being its pacing time between iterations, the original order isn't kept.
+       -s: instruct program to report count, min, max, mean, p50/p90/p99 of every timing phase (ms) and response body size (bytes) per API.
      file: HAR file name.
-    start: start line of API.
-      end: suggested end line of API.
-'''.format(arg)
+    start: entry number of API, as listed by -f option.
+      end: optional last entry number, to extract a range of APIs.
+
+Note: an index file (file{1}) is built on the first scan of a HAR file, later calls seek straight to the entries.
+'''.format(arg, INDEX_SUFFIX)
   print(out_string)
 
 
-def process_all_requests(file, env='UAT'):
-  lines = extract_requests(file, env, cache=True)
-  for i in lines:
-    begin, end = i
-    print('range: {0} {1}'.format(begin, end))
-    process_request(file, begin, end)
+def process_all_requests(file, env='UAT', header=False):
+  for n, request in iter_requests(file, env):
+    print('entry: {0}'.format(n))
+    print_request(request, header)
 
-def process_request(file, begin, end, header=False):
-  buffer = "{"
-  with open(file, 'r') as fh:
-    for line in islice(fh, begin, end):
-      if re.match(r'^      },$', line):
-        buffer += "}"
-        break
-      else: 
-        buffer += str(line.replace(r'\n', ''))
-  try:
-    json_obj =json.loads(buffer)
-  except ValueError as e:
-    print('Value Error(Tried recover)')
-    buffer = re.sub(r'\s*', '', buffer[:1000])
-    x = re.match(r'^(.+)\"headers\"', buffer)
-    buffer = x.group(1)
-    buffer = buffer[:-1] + '}}'
-    json_obj =json.loads(buffer)
-  method = json_obj["request"].get("method")
-  headers = json_obj["request"].get("headers")
-  url = json_obj["request"].get("url")
-  queryString = json_obj["request"].get("queryString")
-  payload = None
-  if json_obj["request"].get("postData"):
-    payload = json_obj["request"].get("postData").get("text", "").encode('utf-8')
-    payload = re.sub(r'>\s*<', '><', payload)
-    payload = re.sub(r'^\s*', '', payload)
-  
-  if payload:
-    try:
-      pretty_str = json.dumps(json.loads(payload), sort_keys=True, indent=2, separators=(',', ':'))
-    except:
-      pretty_str = etree.tostring(etree.fromstring(payload), method='xml', pretty_print=True)
+def process_request(file, begin, end=None, header=False):
+  index = get_index(file)
+  end = begin if end is None else end
+  with open(file, 'rb') as fh:
+    for row in index[begin:end+1]:
+      print('entry: {0}'.format(row["number"]))
+      print_request(read_entry(fh, row).get("request", {}), header)
+
+def print_request(request, header=False):
+  method = request.get("method")
+  headers = request.get("headers")
+  url = request.get("url")
+  queryString = request.get("queryString")
+  pretty_str = None
+  if request.get("postData"):
+    pretty_str = decode_payload(request.get("postData"))
 
   print('')
   if header:
@@ -93,62 +127,503 @@ def process_request(file, begin, end, header=False):
   print("url: {0}".format(url))
   print("method: {0}".format(method))
   print("queryString: {0}".format(queryString))
-  if payload:
+  if pretty_str:
     print("payload:\n{0}".format(pretty_str))
   print('')
 
 
-def extract_requests(file, env='UAT', cache=False):
-#  cmd_str = """grep -n '"url": "https://uat.starhub.com/sfapi' {0} | grep -v '.js",' | grep -v '.html' | grep -v '.css' | grep -v '.png' | grep -v '.json' | grep -v '.js?' | grep -v 'woff' | grep -v '.gif' | sed -e 's/ts=[0-9a-z]*//' | sed -e 's/[\?\&]\"\,/",/'""".format(file)
-  if env == 'UAT':
-    cmd_str = CMD_STR_UAT.format(file)
-  elif env == 'EBS':
-    cmd_str = CMD_STR_EBS.format(file)
+def payload_type(mime, text):
+  '''
+  pick payload decoder by content type, sniffing the first character only when the content type says nothing useful.
+  '''
+  if 'json' in mime:
+    return 'json'
+  elif 'xml' in mime:
+    return 'xml'
+  elif 'x-www-form-urlencoded' in mime:
+    return 'form'
+  elif mime.startswith('multipart/'):
+    return 'raw'
+  lead = text.lstrip()[:1]
+  if lead in ('{', '['):
+    return 'json'
+  elif lead == '<':
+    return 'xml'
+  return 'raw'
+
+def json_payload(text, post_data):
+  return json.dumps(json.loads(text), sort_keys=True, indent=2, separators=(',', ':'))
+
+def xml_payload(text, post_data):
+  text = re.sub(r'>\s*<', '><', text.strip())
+  return etree.tostring(etree.fromstring(text), method='xml', pretty_print=True)
+
+def form_payload(text, post_data):
+  # HAR usually carries form params already split, only fall back to parse the text when it doesn't.
+  if post_data.get("params"):
+    params = [(p.get("name", ""), p.get("value", "")) for p in post_data.get("params")]
+  else:
+    params = [(k.decode('utf-8', 'replace'), v.decode('utf-8', 'replace'))
+              for k, v in urlparse.parse_qsl(text, keep_blank_values=True)]
+  # same type as the other decoders, a unicode result breaks the str templates in print_request.
+  return u'\n'.join(u'{0}={1}'.format(k, v) for k, v in params).encode('utf-8')
+
+def raw_payload(text, post_data):
+  return text
+
+PAYLOAD_DECODERS = {
+  'json': json_payload,
+  'xml': xml_payload,
+  'form': form_payload,
+  'raw': raw_payload,
+}
+
+def decode_payload(post_data):
+  '''
+  decode HAR postData into a printable string. A base64 encoded body (encoding: base64) is decoded first,
+  then the decoder is chosen by mimeType. A body which doesn't match its content type is printed as is.
+  '''
+  text = post_data.get("text", "")
+  if not text:
+    return None
+  text = text.encode('utf-8')
+  try:
+    if post_data.get("encoding") == "base64":
+      text = base64.b64decode(text)
+    mime = post_data.get("mimeType", "").split(';')[0].strip().lower()
+    kind = payload_type(mime, text)
+    return PAYLOAD_DECODERS[kind](text, post_data)
+  except (TypeError, binascii.Error, ValueError, etree.XMLSyntaxError): # py2 b64decode raises TypeError on bad padding
+    return text
+
+
+def match_env(url, env='UAT'):
+  '''
+  evaluate if an url is an API of given environment, i.e. not a static asset such as .js, .css or images.
+  '''
+  pattern = URL_PATTERN.get(env, URL_PATTERN['PRD'])
+  return pattern.search(url) and not STATIC_PATTERN.search(url)
+
+def normalise_url(url):
+  '''
+  strip the cache busting ts= query param and a dangling ? or & left behind.
+  '''
+  url = TS_PATTERN.sub('', url, count=1)
+  if url.endswith('?') or url.endswith('&'):
+    url = url[:-1]
+  return url
+
+def iter_entries(file, chunk=CHUNK_SIZE):
+  '''
+  walk log.entries of a HAR file once, yielding (entry number, byte offset, length, entry) per entry.
+  The file is read chunk by chunk and an entry is decoded as soon as it is complete, so memory stays bounded by
+  the largest entry rather than by the file size.
+  '''
+  decoder = json.JSONDecoder()
+  with open(file, 'rb') as fh:
+    base = 0 # file offset of buffer[0]
+    buffer = fh.read(chunk)
+    m = ENTRIES_PATTERN.search(buffer)
+    while not m:
+      more = fh.read(chunk)
+      if not more:
+        return
+      # keep a short tail in case the "entries" key straddles two chunks
+      tail = buffer[-64:]
+      base += len(buffer) - len(tail)
+      buffer = tail + more
+      m = ENTRIES_PATTERN.search(buffer)
+
+    n = 0
+    pos = m.end()
+    while True:
+      pos = SEP_PATTERN.match(buffer, pos).end()
+      if buffer.startswith(']', pos):
+        return
+      try:
+        if pos == len(buffer):
+          raise ValueError('need more data')
+        entry, end = decoder.raw_decode(buffer, pos)
+      except ValueError:
+        # entry incomplete, read more; growing the read size keeps huge entries linear.
+        more = fh.read(max(chunk, len(buffer)))
+        if not more:
+          raise ValueError('{0}: truncated entry at byte {1}'.format(file, base + pos))
+        base += pos
+        buffer = buffer[pos:] + more
+        pos = 0
+        continue
+      yield n, base + pos, end - pos, entry
+      n += 1
+      pos = end
+
+def iter_requests(file, env='UAT'):
+  '''
+  yield (entry number, request) for every API request of given environment in a HAR file.
+  '''
+  for n, entry in iter_api_entries(file, env):
+    yield n, entry.get("request", {})
+
+def iter_api_entries(file, env='UAT'):
+  '''
+  yield (entry number, entry) for every API entry of given environment in a HAR file.
+  With an up to date index only the matching entries are read, otherwise the file is streamed once and the index
+  is built on the way.
+  '''
+  index = load_index(file)
+  if index is not None:
+    with open(file, 'rb') as fh:
+      for row in index:
+        if match_env(row["url"], env):
+          yield row["number"], read_entry(fh, row)
+    return
+
+  rows = []
+  for n, offset, length, entry in iter_entries(file):
+    rows.append(index_row(n, offset, length, entry))
+    if match_env(entry.get("request", {}).get("url", ""), env):
+      yield n, entry
+  write_index(file, rows)
+
+
+def index_row(n, offset, length, entry):
+  request = entry.get("request", {})
+  response = entry.get("response", {})
+  timings = entry.get("timings", {})
+  size = response.get("bodySize", -1)
+  if size < 0:
+    size = response.get("content", {}).get("size", 0)
+  row = {"number": n, "offset": offset, "length": length, "method": request.get("method", ""), "url": request.get("url", ""),
+         "status": response.get("status", 0), "size": size, "time": entry.get("time", -1)}
+  for k in TIMINGS:
+    row[k] = timings.get(k, -1)
+  return row
+
+def index_stamp(file):
+  st = os.stat(file)
+  return '# har_ana index {0} size={1} mtime={2}\n'.format(INDEX_VERSION, st.st_size, int(st.st_mtime))
+
+def write_index(file, rows):
+  '''
+  dump index rows into the sidecar file, stamped with HAR file's size and mtime to detect a stale index, and closed by a
+  trailer of the row count to detect a truncated one. written to a temporary file renamed into place, so that a killed or
+  concurrent writer never leaves a partial index behind.
+  '''
+  tmp = '{0}{1}.{2}.tmp'.format(file, INDEX_SUFFIX, os.getpid())
+  try:
+    with open(tmp, 'wb') as fh:
+      fh.write(index_stamp(file))
+      for row in rows:
+        line = u'\t'.join(u'{0}'.format(row[k]) for k in INDEX_FIELDS)
+        fh.write(line.encode('utf-8') + '\n')
+      fh.write('# rows={0}\n'.format(len(rows)))
+    os.rename(tmp, file + INDEX_SUFFIX)
+  except (IOError, OSError) as e:
+    sys.stderr.write('Warning: index not saved, {0}\n'.format(e))
+    if os.path.exists(tmp):
+      os.remove(tmp)
+
+def load_index(file):
+  '''
+  load the sidecar index of a HAR file, None if it doesn't exist, is out of date or can't be parsed in full.
+  '''
+  try:
+    with open(file + INDEX_SUFFIX, 'rb') as fh:
+      if fh.readline() != index_stamp(file):
+        return None
+      rows = []
+      for line in fh:
+        if line.startswith('# rows='):
+          return rows if int(line[len('# rows='):]) == len(rows) else None
+        row = dict(zip(INDEX_FIELDS, line.decode('utf-8').rstrip('\n').split('\t')))
+        for k in INDEX_FIELDS[:3] + INDEX_FIELDS[5:7]:
+          row[k] = int(row[k])
+        for k in INDEX_FIELDS[7:]:
+          row[k] = float(row[k])
+        rows.append(row)
+      return None # no trailer, truncated
+  except (IOError, OSError, KeyError, ValueError):
+    return None
+
+def get_index(file):
+  index = load_index(file)
+  if index is None:
+    index = [index_row(n, offset, length, entry) for n, offset, length, entry in iter_entries(file)]
+    write_index(file, index)
+  return index
+
+def read_entry(fh, row):
+  '''
+  random access to an entry by its byte offset, costs O(entry size) regardless of HAR file size.
+  '''
+  fh.seek(row["offset"])
+  return json.loads(fh.read(row["length"]))
+
+
+def collect_signatures(args):
+  '''
+  pool worker, returns a HAR file's deduplicated API signatures, i.e. {(method, normalised url): count}, and None, or None
+  and the error of a HAR file which can't be read, e.g. truncated, so that one bad file doesn't abort the batch.
+  '''
+  file, env = args
+  sigs = {}
+  try:
+    for row in get_index(file):
+      if match_env(row["url"], env):
+        sig = (row["method"], normalise_url(row["url"]))
+        sigs[sig] = sigs.get(sig, 0) + 1
+  except Exception as e:
+    return file, None, '{0}: {1}'.format(type(e).__name__, e)
+  return file, sigs, None
+
+def process_batch(path, env='UAT', procs=None):
+  if os.path.isdir(path):
+    files = sorted(glob.glob(os.path.join(path, '*.har')))
   else:
-    cmd_str = CMD_STR_PROD.format(file)
-  result = os.popen(cmd_str).read().split('\n')
-  first = True
-  cached = []
-  buffer = {} 
-  if not cache:
-    print('')    
-  for l in result:
-    a = re.match(r'^([0-9]+): +\"url\": \"([^"]*)\",$', l)
-    if a:
-      if first:
-        buffer["number"] = int(a.group(1)) - 3
-        buffer["url"] = a.group(2)
-        first = False
-      else:
-        if int(a.group(1)) - 3 < 1000:
-          if not cache:
-            print('{0:6d} {1:6d} -- {2}'.format(buffer["number"], int(a.group(1)) - 4, buffer["url"]))
-          else:
-            cached.append((buffer["number"], int(a.group(1)) - 4))
-        else:
-          if not cache:
-            print('{0:6d} {1:6d} -- {2}'.format(buffer["number"], buffer["number"]+1000, buffer["url"]))
-          else:
-            cached.append((buffer["number"], int(a.group(1)) - 4))
-        buffer["number"] = int(a.group(1)) - 3
-        buffer["url"] = a.group(2)
-  if not cache:
-    print('')    
-
-  return cached
+    files = sorted(glob.glob(path))
+  if not files:
+    print('No HAR file found: {0}'.format(path))
+    return
+
+  # fan files out across processes, merge signatures as workers complete.
+  inventory = {}
+  failed = {}
+  pool = multiprocessing.Pool(procs)
+  try:
+    for file, sigs, err in pool.imap_unordered(collect_signatures, [(f, env) for f in files]):
+      if err:
+        failed[file] = err
+        continue
+      for sig, cnt in sigs.items():
+        inventory.setdefault(sig, {})[file] = cnt
+  finally:
+    pool.close()
+    pool.join()
+  for file in sorted(failed):
+    sys.stderr.write('Skipped {0}, {1}\n'.format(file, failed[file]))
+  files = [f for f in files if f not in failed]
+
+  writer = csv.writer(sys.stdout, lineterminator='\n')
+  writer.writerow(["METHOD", "URL", "TOTAL", "FILES"] + [os.path.basename(f) for f in files])
+  for sig in sorted(inventory):
+    counts = inventory[sig]
+    writer.writerow([sig[0], sig[1].encode('utf-8'), sum(counts.values()), len(counts)] + [counts.get(f, 0) for f in files])
+
+
+def probe_params():
+  return [':'.join('HP{0}S{1}'.format(i, j) for j in range(PROBE_FIELDS)) for i in range(PROBE_PARAMS)]
+
+def probe_slot(m):
+  '''
+  (param index, sub field index) of a probe match, sub field index is None when the whole param is used.
+  '''
+  if m.group(1):
+    return int(m.group(1)), None
+  return int(m.group(2)), int(m.group(3))
+
+def template_regex(res):
+  '''
+  turn a probed resource name into an url regex plus the param slot of each regex group.
+  '''
+  parts = []
+  slots = []
+  pos = 0
+  for m in PROBE_PATTERN.finditer(res):
+    parts.append(re.escape(res[pos:m.start()]))
+    parts.append(r'([^/?&]*)')
+    slots.append(probe_slot(m))
+    pos = m.end()
+  parts.append(re.escape(res[pos:]))
+  return re.compile(r'(?:^|/)' + ''.join(parts) + '$'), slots
+
+def query_slots(driver, tc_id):
+  '''
+  map querystring keys of a TC onto its param slots, by probing the TC's payload template.
+  '''
+  try:
+    if not driver.query_str_fl(tc_id):
+      return {}
+    _, payload = driver.get_payload(tc_id, probe_params(), True)
+  except Exception:
+    return {}
+  slots = {}
+  for k, v in (payload or {}).items():
+    if isinstance(v, basestring):
+      m = PROBE_PATTERN.match(v)
+      if m and m.end() == len(v):
+        slots[k] = probe_slot(m)
+  return slots
+
+def driver_templates(driver):
+  '''
+  probe every TC id (A00 to Z99) of a driver's get_res_n_met table and build url templates out of the real APIs.
+  Pseudo TCs and catch-all TCs, whose resource name is nothing but a param, are left out.
+  '''
+  templates = []
+  for tc_id in ['{0}{1:02d}'.format(c, i) for c in string.ascii_uppercase for i in range(100)]:
+    seen = set()
+    # probe with empty params too, to cover resource names which change shape when a param is absent
+    for params in (probe_params(), ['']*PROBE_PARAMS):
+      met = driver.get_res_n_met(tc_id, params)
+      if not met or not met[0] or met[0] == 'OTHERS' or not met[1]:
+        break
+      method, res, auth = met[:3]
+      if not PROBE_PATTERN.sub('', res).strip('/') or res in seen:
+        continue
+      seen.add(res)
+      regex, slots = template_regex(res)
+      templates.append({"tc_id": tc_id, "method": method, "auth": auth == 'Y', "regex": regex, "slots": slots,
+                        "query": query_slots(driver, tc_id), "query_in_res": '?' in res})
+  return templates
+
+def fill_slot(params, slot, value):
+  i, j = slot
+  if j is None:
+    params[i] = value
+  else:
+    fields = params[i].split(':') if params[i] else []
+    fields += [''] * (j + 1 - len(fields))
+    fields[j] = value
+    params[i] = ':'.join(fields)
+
+def match_tc(templates, request):
+  '''
+  match a HAR request against url templates, returns (tc_id, params) of the most specific template or None.
+  '''
+  url = urlparse.urlsplit(normalise_url(request.get("url", "")))
+  path = url.path.lstrip('/')
+  query = urlparse.parse_qsl(url.query, keep_blank_values=True)
+  best = None
+  for t in templates:
+    if t["method"] != request.get("method"):
+      continue
+    m = t["regex"].search(path + '?' + url.query if t["query_in_res"] else path)
+    if not m:
+      continue
+    params = [''] * PROBE_PARAMS
+    for slot, value in zip(t["slots"], m.groups()):
+      fill_slot(params, slot, value)
+    hits = 0
+    for k, v in query:
+      if k in t["query"]:
+        fill_slot(params, t["query"][k], v)
+        hits += 1
+    if t["auth"] and not params[1]:
+      for h in request.get("headers", []):
+        if h.get("name", "").lower() == 'authorization':
+          params[1] = h.get("value", "")
+    score = (hits, len(t["regex"].pattern))
+    if best is None or score > best[0]:
+      best = (score, t["tc_id"], params)
+  return None if best is None else best[1:]
+
+def started_time(entry):
+  '''
+  startedDateTime of an entry as datetime, timezone suffix ignored since only gaps between entries matter.
+  '''
+  m = re.match(r'(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(\.\d+)?', entry.get("startedDateTime", ""))
+  if not m:
+    return None
+  ts = datetime.strptime(m.group(1), '%Y-%m-%dT%H:%M:%S')
+  return ts.replace(microsecond=int(float(m.group(2) or 0) * 1000000))
+
+def generate_tc_files(file, env='UAT'):
+  # drivers are imported on demand only, for their dependencies. their log file is opened on first record, none is created here.
+  drivers = [(name, __import__(name)) for name in DRIVERS]
+  templates = [(name, driver_templates(driver)) for name, driver in drivers]
+  lines = dict((name, []) for name in DRIVERS)
+  last = dict((name, None) for name in DRIVERS)
+  unmatched = 0
+  for n, entry in iter_api_entries(file, env):
+    request = entry.get("request", {})
+    started = started_time(entry)
+    matched = False
+    for name, tmpl in templates:
+      tc = match_tc(tmpl, request)
+      if tc is None:
+        continue
+      matched = True
+      tc_id, params = tc
+      while params and not params[-1]:
+        params.pop()
+      gap = 0
+      if started and last[name]:
+        gap = max(0, int((started - last[name]).total_seconds() * 1000))
+      last[name] = started
+      lines[name].append(u'# entry {0}: {1} {2}'.format(n, request.get("method"), normalise_url(request.get("url", ""))))
+      lines[name].append(u','.join([tc_id] + params + ['+a', str(gap)]))
+    if not matched:
+      unmatched += 1
+      print('unmatched entry {0}: {1} {2}'.format(n, request.get("method"), normalise_url(request.get("url", ""))))
+
+  for name in DRIVERS:
+    if not lines[name]:
+      continue
+    out = '{0}.{1}.tc'.format(file, name)
+    with open(out, 'w') as fh:
+      fh.write('# generated by {0} {1} from {2}, replay in order with the gaps (+a pacing) with: {3}.py -f {4}\n'.format(
+        os.path.basename(sys.argv[0]), version, file, name, out))
+      fh.write('# with -M each line loops on its own thread, the gap being its pacing time, and the order is not kept.\n')
+      for line in lines[name]:
+        fh.write(line.encode('utf-8') + '\n')
+    print('{0}: {1} requests.'.format(out, len(lines[name]) / 2))
+  print('{0} requests not matched.'.format(unmatched))
+
+
+def timing_stats(file, env='UAT'):
+  '''
+  aggregate HAR timings per API. Rows are taken from the index, grouped with one sort and every group is summarised
+  column-wise by numpy; phases not applicable to an entry (-1 in HAR) are left out of that phase's figures.
+  '''
+  rows = [row for row in get_index(file) if match_env(row["url"], env)]
+  if not rows:
+    return
+  apis = np.array([u'{0} {1}'.format(row["method"], normalise_url(row["url"])) for row in rows])
+  data = np.array([[row[k] for k in PHASES] for row in rows], dtype=float)
+  data[data < 0] = np.nan
+
+  keys, inverse, counts = np.unique(apis, return_inverse=True, return_counts=True)
+  order = np.argsort(inverse, kind='mergesort')
+  groups = np.split(data[order], np.cumsum(counts)[:-1])
+
+  writer = csv.writer(sys.stdout, lineterminator='\n')
+  writer.writerow(["METHOD", "URL", "PHASE", "COUNT", "MIN", "MAX", "MEAN"] + ["P{0}".format(p) for p in PERCENTILES])
+  with warnings.catch_warnings():
+    warnings.simplefilter('ignore', RuntimeWarning) # all-NaN phases, e.g. dns/ssl of a kept-alive connection
+    for key, group in zip(keys, groups):
+      cnt = np.count_nonzero(~np.isnan(group), axis=0)
+      stats = np.vstack([np.nanmin(group, axis=0), np.nanmax(group, axis=0), np.nanmean(group, axis=0),
+                         np.nanpercentile(group, PERCENTILES, axis=0)])
+      method, url = key.split(' ', 1)
+      for i, phase in enumerate(PHASES):
+        if cnt[i] == 0:
+          continue
+        writer.writerow([method, url.encode('utf-8'), phase, cnt[i]] + ['{0:.3f}'.format(v) for v in stats[:, i]])
+
+
+def extract_requests(file, env='UAT'):
+  print('')
+  for row in get_index(file):
+    if match_env(row["url"], env):
+      print('{0:6d} {1:4d} {2:10.3f} -- {3} {4}'.format(row["number"], row["status"], row["time"], row["method"], normalise_url(row["url"]).encode('utf-8')))
+  print('')
 
 
 def main():
   q_flag = False
   p_flag = False
   f_flag = False
+  b_flag = False
+  t_flag = False
+  s_flag = False
+  procs = None
   header = False
   usg = True
   ENV = 'UAT'
 
   # parse command line options
   try:
-    opts, args = getopt.getopt(sys.argv[1:], "e:f:q:p:h")
+    opts, args = getopt.getopt(sys.argv[1:], "e:f:q:p:b:j:t:s:h")
   except getopt.GetoptError as err:
     # print help information and exit:
     usage(os.path.basename(sys.argv[0]))
@@ -168,6 +643,20 @@ def main():
       usg = False
       file = a
       p_flag = True
+    elif o == "-b":
+      usg = False
+      path = a
+      b_flag = True
+    elif o == "-j":
+      procs = int(a)
+    elif o == "-t":
+      usg = False
+      file = a
+      t_flag = True
+    elif o == "-s":
+      usg = False
+      file = a
+      s_flag = True
     elif o == "-h":
       header = True
     else:
@@ -180,12 +669,18 @@ def main():
 
   if p_flag:
     begin = int(args[0])
-    end = int(args[1])
+    end = int(args[1]) if len(args) > 1 else None
     process_request(file, begin, end, header)
   elif q_flag:
-    process_all_requests(file, ENV)
+    process_all_requests(file, ENV, header)
   elif f_flag:
     extract_requests(file, ENV)
-    
+  elif b_flag:
+    process_batch(path, ENV, procs)
+  elif t_flag:
+    generate_tc_files(file, ENV)
+  elif s_flag:
+    timing_stats(file, ENV)
+
 if __name__ == "__main__":
   main()
@@ -10,10 +10,29 @@
 # HISTORY:
 #       version 1.0     12/08/2020              --- program initial
 #       version 1.1     12/09/2020              --- change of communication class to new_comm_req.
+#       version 1.2     18/10/2026              --- introduced -b option, logging statistics in binary records.
+#       version 1.3     18/10/2026              --- statistics written by background thread in multi-threads mode.
+#       version 1.4     18/10/2026              --- monotonic clock for response time, introduced -H option to record response phases.
+#       version 1.5     18/10/2026              --- keep-alive connections pooled per end point and shared by all threads, sized by -C option.
+#       version 1.6     18/10/2026              --- introduced -A option, virtual users as greenlets on gevent's event loop.
+#       version 1.7     18/10/2026              --- introduced -T option, open workload model at target arrival rates.
+#       version 1.8     18/10/2026              --- introduced -x option, fixed-rate threads logging lag behind schedule (coordinated omission).
+#       version 1.9     18/10/2026              --- introduced -r option, process wide rate limits globally, per end point and per TC.
 #
-version = 'v1.1'
+version = 'v1.9'
 
 import sys
+# -A option runs virtual users as greenlets, gevent has to patch socket, threading etc. before any of them is imported.
+# getopt takes its value attached as well, e.g. -A200.
+GEVENT = False
+if any(a.startswith('-A') for a in sys.argv[1:]):
+  try:
+    from gevent import monkey
+  except ImportError:
+    print('gevent is required by -A option, e.g. pip install gevent')
+    sys.exit(2)
+  monkey.patch_all()
+  GEVENT = True
 import os
 import time
 from datetime import datetime, timedelta
@@ -24,9 +43,11 @@ import getopt
 import logging
 from multiprocessing.dummy import Pool
 import threading
+import itertools
 import Queue
 from copy import deepcopy
-from new_comm_req import Comm_req, Comm_req2
+from new_comm_req import Comm_req, Comm_req2, Stats, BinSink, Pools, Limits, clock, clock_ns
+from scheduler import OpenModel, rate_fn, RATE_SPECS
 
 # lock to serialize output to log file
 LOCK = threading.Lock()
@@ -35,7 +56,7 @@ TaskQueue = Queue.Queue()
 myApp = os.path.basename(sys.argv[0]).split('.')[0] + '.log' # log file name
 workingDir = os.getcwd() + '/' # creating log file in current working directory
 logger = logging.getLogger(myApp)
-l_fh = logging.FileHandler(workingDir + myApp)
+l_fh = logging.FileHandler(workingDir + myApp, delay=True) # created on first record, not on import e.g. by har_ana.py -t
 formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
 l_fh.setFormatter(formatter)
 logger.addHandler(l_fh) 
@@ -50,7 +71,7 @@ def usage(arg):
   out_string = '''
 This is a generic testing tool which simulats FAPI or service lyer to interact with CC App. Same tool can be used to test consumer CC APIs and EBS CC APIs.
 
-Usage  1: {0} [-e env] [-U] [-d] [-V] [-L min] [-w sec] [-M th_num] [-B rampup] [-c num] -f tc_file
+Usage  1: {0} [-e env] [-U] [-d] [-V] [-L min] [-w sec] [-x ms] [-r limits] [-M th_num] [-C pools] [-A conns] [-T rate] [-B rampup] [-c num] [-b] [-H] -f tc_file
 Usage  2: {0} [-e env] [-U] [-d] [-V] -s tc_id params [+a ::docId:cat]
 Usage  3: {0} -S
 
@@ -60,15 +81,40 @@ where
       env: one of the supported environments, i.e. UAT_EXT, UAT_INT, UAT_EBS, SIT1_EBS
        -M: a flag to instruct program to run in multi-threads.
    th_num: specifying number of threads.
-       -B: ramp up indicator.
+       -C: a flag to instruct program to size the keep-alive connection pools shared by all threads by hereafter pools.
+    pools: pool_connections[:pool_maxsize], i.e. end points (hosts) cached per pool and connections kept alive per end point,
+           e.g. 10:50. pool_maxsize defaults to th_num, or conns of -A; connections beyond it are discarded after use.
+       -A: a flag to instruct program to run the th_num virtual users of -M as greenlets on an event loop (gevent) instead of OS threads,
+           sharing a pool of hereafter conns connections per end point, a user waits for a free connection once all are in use.
+           it generates thousands of concurrent users from one process. requires gevent, e.g. pip install gevent.
+    conns: maximum connections per end point, e.g. 200.
+       -T: a flag to instruct program to run an open workload model instead of th_num looping threads, used together with -M.
+           requests of each line of tc_file are sent at hereafter target arrival rate whatever the response times, by th_num
+           sender threads, the line runs for -L min or -c num requests. each stats record is appended with its lag (sec.) behind
+           the scheduled start, i.e. sender threads short of the rate; -w and -B are ignored.
+     rate: arrival rate spec of each line, one of below, it can be overwritten per line by the 4th +a param,
+           e.g. C07,CMPG-S01534,BNDL-M25078,variants,+a,:::poisson/20{1}       -B: ramp up indicator.
    rampUp: ramp up criterion, in the form of num:seconds, e.g. 5:20 which means instantiating 5 threads every 20 seconds.
        -c: a flag to instruct program to make num of requests with same set of data in tc_file.
       num: a number e.g. 10
+       -b: a flag to instruct program to log statistics as binary records into log_file.bin instead of text lines, used together with -M.
+           the records can be fed to stats.py the same way as text log file.
+       -H: a flag to instruct program to record response phases, i.e. time to first byte and body read time, appended to each stats record.
        -f: a flag to instruct program to retrieve TC id as well as TC params from hereafter input file, e.g. tc_file.
   tc_file: a file contains list of test cases, in the form of tc_id, context parameters, e.g. C07,CMPG-S01534,BNDL-M25078,variants
            to get TC context params descriptions, check through: {0} -S option.
        -w: a flag to instruct program to wait some seconds before submitting next request, concept of pacing time.
       sec: number of milli seconds to wait, e.g. 3000 means 3000 milli seconds i.e. 3 seconds.
+       -x: a flag to instruct program to start each thread's iterations at a fixed rate, every hereafter ms milli seconds, in place
+           of the pacing time of -w, used together with -M. an iteration delayed past its intended start, e.g. by a server stall,
+           starts at once and its stats record is appended with its lag (sec.) behind the intended start; stats.py reports
+           percentiles corrected by the lag (coordinated omission) next to the raw ones.
+       ms: intended interval between iterations of a thread, i.e. expected response time plus pacing, e.g. 1200.
+       -r: a flag to instruct program to cap the request rate of the whole process by hereafter limits, whatever the threads.
+   limits: rate limits delimited by ",", rate[/burst] for all requests, or key=rate[/burst] for the requests of an end point
+           (scheme://host:port, any path is ignored) or a TC, in requests per second with up to burst requests at once (default
+           to 1), e.g. 50,C07=5,http://172.20.60.215:6700=20/5
+           a TC's limit can be set by the 5th +a param in tc_file as well, e.g. C07,CMPG-S01534,BNDL-M25078,variants,+a,::::5
        -L: a flag to instruct program to run test for x number of minutes.
       min: number of minutes, e.g. 60, which means 60 minutes or 1 hour.
        -s: request to execute one single test case determined by hereafter tc_id
@@ -80,8 +126,10 @@ where
            the +a option can also be used in multi-threads testing mode, included below is an example which tells program to wait 300 
            milliseconds before entering next iteration, that way it controls per thread's execution rate.
            C07,CMPG-S01534,BNDL-M25078,variants,+a,300
+           without -M, the lines of tc_file run in order and the same 300 milliseconds are slept before the line, e.g. to replay the
+           gaps of a tc_file generated by har_ana.py -t.
 
-'''.format(arg)
+'''.format(arg, RATE_SPECS)
   print(out_string)
 
 # dump scenarios' descriptions
@@ -643,13 +691,13 @@ def common_func(tc_id, context, param_list, verbose=True, **kw):
   # integrate with dynatrace
   headers['x-dynatrace-test'] += ';PC={0};TSN={1};VU=Singleton'.format(res, tc_id)
 
-  start = time.time()
+  start = clock()
   for i in range(Tries):
     r = req.submit_req(res, method, headers, data=payload, params=querystr, TC=tc_id, INPUT=params_str, A_P=A_P)
     if r.status_code != 202 or not retry:
       break
     time.sleep(fibonacci(i+1))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
 
   etag = ''
@@ -810,8 +858,111 @@ def common_worker(req, res, headers, payload, querystr, method, log, tc_id, para
       break
     time.sleep(fibonacci(i+1))
   
+def prepare(item_x, log, t_name, ctl, concurrent=False):
+  '''
+  prepares the work of one tc_file line, i.e. a function making one iteration of its requests, and returns it with the line's
+  rate spec, None if the line has none. ctl is the execution control of the thread: pacing_time, think_t, lFlag, ending and cnt,
+  which are overwritten in place by the line's thread level params, see worker. concurrent is set by the open model, whose work
+  runs on several sender threads at once.
+  '''
+  tc_id = item_x.split(',')[0].lstrip().rstrip()
+  headers = get_headers(tc_id)
+  retry = get_202_retry(tc_id)
+  do_work = get_do_worker(tc_id)
+  param_list = item_x.split(',')[1:]
+
+  method, res, _, _ = get_res_n_met(tc_id, param_list) # get respective request method, resource name and auth flag
+  payload = None
+  querystr = None
+
+  # integrate with dynatrace
+  headers['x-dynatrace-test'] += ';PC={0};TSN={1};VU={2}'.format(res, tc_id, t_name)
+
+  a_p = "N" # addtional parameter to support statisticss, to sort out different cases.
+  rate = None
+  if len(param_list) >= 2 and param_list[-2] == '+a':
+    a_param_list = (param_list[-1] + ":::::").split(":")
+    #print(a_param_list)
+    # 1st param to overwrite global pacing_time param
+    if a_param_list[0]:
+      ti_dict = dict(enumerate(a_param_list[0].split(";"))) # pacing time and think time override control
+      if ti_dict.get(0, ''): # pacing time
+        ctl['pacing_time'] = int(ti_dict.get(0)) / 1000.0
+      if ti_dict.get(1, ''): # think time
+        ctl['think_t'] = int(ti_dict.get(1)) / 1000.0
+    # 2nd additional param consists of 3 control elements, 1) override excution duration; 2) override number of execution count;
+    # override globle -U flag.
+    if a_param_list[1]:
+      ctl_dict = dict(enumerate(a_param_list[1].split(";")))
+      #print(ctl_dict)
+      if ctl_dict.get(2, ''): # token overwritten control
+        if ctl_dict.get(2, '') == 'U':
+          CONTEXT['u_flag'] = True
+        else:
+          CONTEXT['u_flag'] = False
+        #print("U override")
+      if ctl_dict.get(0, ''): # execution duration overwritten control
+        ctl['ending'] = time.time() + float(int(ctl_dict.get(0)) * 60) # set estimated ending time.
+        ctl['lFlag'] = True # duration dominant
+      if ctl_dict.get(1, '') and not ctl_dict.get(0, '') : # number of execution count overwritten control
+        ctl['cnt'] = int(ctl_dict.get(1))
+        ctl['lFlag'] = False # count dominant
+
+    param_list = param_list[:-2]
+    a_p = a_param_list[2] if len(a_param_list[2]) > 0 else "N"
+    # 4th param, arrival rate of this line in open model (-T option)
+    rate = a_param_list[3] or None
+    # 5th param, rate limit of this TC, see -r option
+    if a_param_list[4]:
+      try:
+        Limits.set(tc_id, a_param_list[4])
+      except ValueError as err:
+        print('Invalid rate limit of {0}: {1}'.format(tc_id, err))
+
+  req = Comm_req(log, get_end_point(tc_id))
+#  if auth:
+#    hubId, passwd = (param_list[0]+":").split(":")[:2]
+#    if CONTEXT['u_flag']:
+#      u_token = passwd
+#    elif isToken(passwd):
+#      u_token = passwd
+#    else:
+#      u_token = login(req, CONTEXT, hubId, passwd, verbose=False)
+#    headers['authorization'] = u_token
+#    if u_token is None:
+#      return None
+#    param_list[0] = ':'.join([hubId, u_token])
+
+
+  if method: # if method is None, it means pseudo TC
+    payload, querystr = get_payload(tc_id, param_list, query_str_fl(tc_id)) # get respective TC payload
+    #url = get_end_point(tc_id) + res
+
+  param_list.append(1) # param used as a flip and flap switch to some TCs.
+  think_t = ctl['think_t']
+  if not concurrent:
+    # closed model: one thread runs the line, the same headers and params go to every iteration, so state do_work keeps in
+    # them, e.g. a token or a cookie, carries over to the next one.
+    def work():
+      param_list[-1] ^= 1
+      do_work(req, res, headers, payload, querystr, method, log, tc_id, param_list, retry, a_p, think_t)
+    return work, rate
+
+  flips = itertools.count()
+  # work runs on several sender threads at once in open model: each thread has its own Comm_req (session and cookies),
+  # each dispatch its own copy of params and headers.
+  local = threading.local()
+  local.req = req
+  def work():
+    if not hasattr(local, 'req'):
+      local.req = Comm_req(log, get_end_point(tc_id))
+    params = param_list[:]
+    params[-1] = next(flips) % 2
+    do_work(local.req, res, dict(headers), payload, querystr, method, log, tc_id, params, retry, a_p, think_t)
+  return work, rate
+
 # the worker thread pulls an item from the queue and processes it
-def worker(CNT, L_flag, ENDING, DELAY_START, PACING_TIME, log, dt_id, t_name):
+def worker(CNT, L_flag, ENDING, DELAY_START, PACING_TIME, log, dt_id, t_name, INTERVAL=0):
   '''
   if L_flag is True, then execution control is duration dominant otherwise it is count dominant.
   Duration dominant has higher priority if both L_flag and CNT are specified.
@@ -819,102 +970,59 @@ def worker(CNT, L_flag, ENDING, DELAY_START, PACING_TIME, log, dt_id, t_name):
   pacing time for each iteration, and overwritten global execution duration and reset the execution duration to 30 mins for this thread,
   the U flag to tell program to treat hub_id as token for this tread;
   or ;3000:;20, which means overwritten global setting and execute this thread 20 times, it takes 3000 milli seconds think time.
-  thread level param is composed of pacing_t;think_t:duration;iteration;U:log_prefix
+  thread level param is composed of pacing_t;think_t:duration;iteration;U:log_prefix:rate:limit
+  if INTERVAL (milli seconds) is given, iterations start at a fixed rate in place of the pacing time, see Stats.pace.
   '''
-  lFlag = L_flag
-  cnt = CNT
-  ending = ENDING
-  pacing_time = int(PACING_TIME)/1000.0
+  ctl = {'cnt': CNT, 'lFlag': L_flag, 'ending': ENDING, 'pacing_time': int(PACING_TIME)/1000.0, 'think_t': 0}
+  interval = int(INTERVAL)/1000.0
   time.sleep(DELAY_START)
-  think_t = 0
 
   while True:
     if TaskQueue is None or TaskQueue.empty():
       return
 
     item_x = TaskQueue.get()
-    tc_id = item_x.split(',')[0].lstrip().rstrip()
-    headers = get_headers(tc_id)
-    retry = get_202_retry(tc_id)
-    do_work = get_do_worker(tc_id)
-    param_list = item_x.split(',')[1:]
-
-    method, res, _, _ = get_res_n_met(tc_id, param_list) # get respective request method, resource name and auth flag
-    payload = None
-    querystr = None
-
-    # integrate with dynatrace
-    headers['x-dynatrace-test'] += ';PC={0};TSN={1};VU={2}'.format(res, tc_id, t_name)
-
-    a_p = "N" # addtional parameter to support statisticss, to sort out different cases.
-    if len(param_list) >= 2 and param_list[-2] == '+a':
-      a_param_list = (param_list[-1] + ":::").split(":")
-      #print(a_param_list)
-      # 1st param to overwrite global pacing_time param
-      if a_param_list[0]:
-        ti_dict = dict(enumerate(a_param_list[0].split(";"))) # pacing time and think time override control
-        if ti_dict.get(0, ''): # pacing time
-          pacing_time = int(ti_dict.get(0)) / 1000.0
-        if ti_dict.get(1, ''): # think time
-          think_t = int(ti_dict.get(1)) / 1000.0
-      # 2nd additional param consists of 3 control elements, 1) override excution duration; 2) override number of execution count;
-      # override globle -U flag.
-      if a_param_list[1]:
-        ctl_dict = dict(enumerate(a_param_list[1].split(";")))
-        #print(ctl_dict)
-        if ctl_dict.get(2, ''): # token overwritten control
-          if ctl_dict.get(2, '') == 'U':
-            CONTEXT['u_flag'] = True
-          else:
-            CONTEXT['u_flag'] = False
-          #print("U override")
-        if ctl_dict.get(0, ''): # execution duration overwritten control
-          ending = time.time() + float(int(ctl_dict.get(0)) * 60) # set estimated ending time.
-          lFlag = True # duration dominant
-        if ctl_dict.get(1, '') and not ctl_dict.get(0, '') : # number of execution count overwritten control
-          cnt = int(ctl_dict.get(1))
-          lFlag = False # count dominant
-          
-      param_list = param_list[:-2]
-      a_p = a_param_list[2] if len(a_param_list[2]) > 0 else "N"
-
-    req = Comm_req(log, get_end_point(tc_id))
-#    if auth:
-#      hubId, passwd = (param_list[0]+":").split(":")[:2]
-#      if CONTEXT['u_flag']:
-#        u_token = passwd
-#      elif isToken(passwd):
-#        u_token = passwd
-#      else:
-#        u_token = login(req, CONTEXT, hubId, passwd, verbose=False)
-#      headers['authorization'] = u_token
-#      if u_token is None:
-#        TaskQueue.task_done()
-#        continue
-#      param_list[0] = ':'.join([hubId, u_token])
-
-
-    if method: # if method is None, it means pseudo TC
-      payload, querystr = get_payload(tc_id, param_list, query_str_fl(tc_id)) # get respective TC payload
-      #url = get_end_point(tc_id) + res
-
-    param_list.append(1) # param used as a flip and flap switch to some TCs.
-    if lFlag: # control by duration
+    work, _ = prepare(item_x, log, t_name, ctl)
+    if ctl['lFlag']: # control by duration
       while True:
         current = time.time()
-        if current < ending:
-          time.sleep(float(pacing_time))
-          param_list[-1] ^= 1
-          do_work(req, res, headers, payload, querystr, method, log, tc_id, param_list, retry, a_p, think_t)
+        if current < ctl['ending']:
+          time.sleep(Stats.pace(interval) if interval else float(ctl['pacing_time']))
+          work()
         else:
           break
     else: # control by number of iterations
-      for _ in range(cnt):
-        time.sleep(float(pacing_time))
-        param_list[-1] ^= 1
-        do_work(req, res, headers, payload, querystr, method, log, tc_id, param_list, retry, a_p, think_t)
+      for _ in range(ctl['cnt']):
+        time.sleep(Stats.pace(interval) if interval else float(ctl['pacing_time']))
+        work()
     TaskQueue.task_done()
 
+def open_model(fn, spec, THREADS, CNT, L_flag, ENDING, log):
+  '''
+  open workload model of -T option: each line of tc_file is sent at arrival rate spec, or its own rate of +a params, by THREADS
+  sender threads, for the execution duration or count of the line.
+  '''
+  model = OpenModel(THREADS)
+  with open(fn, 'r') as fh:
+    for k, line in enumerate(fh):
+      line = line.rstrip('\n').lstrip() + '#'
+      if line.startswith('#') or not line:
+        continue
+      line = line.split('#')[0].strip('\r').rstrip()
+      ctl = {'cnt': CNT, 'lFlag': L_flag, 'ending': ENDING, 'pacing_time': 0, 'think_t': 0}
+      work, rate = prepare(line, log, 'L{0:02d}'.format(k + 1), ctl, concurrent=True)
+      rate = rate or spec
+      try:
+        rate_fn(rate)
+      except ValueError as err:
+        print('line {0}: {1}'.format(k + 1, err))
+        continue
+      if ctl['lFlag']:
+        model.add(rate, work, end_ns=clock_ns() + int((ctl['ending'] - time.time()) * 1e9))
+      else:
+        model.add(rate, work, count=ctl['cnt'])
+  model.run()
+
 # Define a main() function
 def main():
   ###############################
@@ -924,6 +1032,12 @@ def main():
   L_flag = False
   M_flag = False
   V_flag = False
+  b_flag = False
+  conns = 0 # connections per end point of greenlet engine, set by -A option
+  pool_conns = None # end points cached per connection pool, set by -C option
+  pool_size = None # connections kept alive per end point, set by -C option
+  rate_spec = None # target arrival rate of open model, set by -T option
+  interval = 0 # milli seconds between intended starts of a thread's iterations, set by -x option
   ENV = None
   DT_ID = None
   pacing_time = 0
@@ -939,7 +1053,7 @@ def main():
 
   # parse command line options
   try:
-    opts, args = getopt.getopt(sys.argv[1:], "e:f:s:w:L:M:c:D:B:ShdvV")
+    opts, args = getopt.getopt(sys.argv[1:], "e:f:s:w:x:r:C:L:M:A:T:c:D:B:bHShdvV")
   except getopt.GetoptError as err:
     # print help information and exit:
     logger.error(err)
@@ -962,11 +1076,43 @@ def main():
       DT_ID = a # Dynatrace id
     elif o == "-w":
       pacing_time = a
+    elif o == "-x":
+      interval = a
+      Stats.lags = True
+    elif o == "-r":
+      try:
+        Limits.configure(a)
+      except ValueError as err:
+        print('Invalid rate limits {0}: {1}'.format(a, err))
+        sys.exit(2)
+    elif o == "-C":
+      try:
+        pool_conns, pool_size = [int(n) if n else None for n in (a + ':').split(':')[:2]]
+      except ValueError:
+        print('Invalid pools {0}, expected pool_connections[:pool_maxsize], e.g. 10:50'.format(a))
+        sys.exit(2)
     elif o == "-c":
       M_CNT = int(a)
     elif o == "-M":
       M_flag = True
       THREADS = int(a)
+    elif o == "-A":
+      conns = int(a)
+      if not GEVENT: # e.g. -A in a group of flags such as -bA200, seen by getopt only
+        print('-A option must be given on its own, e.g. -A {0}'.format(a))
+        sys.exit(2)
+    elif o == "-T":
+      try:
+        rate_fn(a)
+      except ValueError as err:
+        print(err)
+        sys.exit(2)
+      rate_spec = a
+      Stats.lags = True
+    elif o == "-b":
+      b_flag = True
+    elif o == "-H":
+      Stats.phases = True
     elif o == "-d":
       CONTEXT['debug'] = True
     elif o == "-v":
@@ -1027,6 +1173,10 @@ def main():
             param_list = line.split(',')[1:]
             if len(param_list) >= 2 and (param_list[-2] == '+a'):
               a_param_list = (param_list[-1] + ":::").split(":")
+              # 1st additional param, pacing time slept before this line, e.g. the gaps of a tc_file generated by har_ana.py -t
+              pacing = a_param_list[0].split(";")[0]
+              if pacing:
+                time.sleep(int(pacing) / 1000.0)
               # 2nd additional params to override globle -U flag.
               if a_param_list[1]:
                 if a_param_list[1] == '1':
@@ -1069,43 +1219,57 @@ def main():
       print('Program started with multi-threading, checking log file for prograss: {0}'.format(t_log_name))
       t_log = thread_logger(myApp, THREADS, ts) # get thread logger
       CONTEXT['t_log'] = t_log
-      while True:
-        # stuff work items on the queue (in this case, just a tuple of TC id and param list).
-        with open(fn, 'r') as fh:
-          for line in fh:
-            line = line.rstrip('\n').lstrip() + '#'
-            if line.startswith('#') or not line:
-              continue
-            line = line.split('#')[0].strip('\r').rstrip()
-            # put TC id, and context parameters into a queue
-            TaskQueue.put(line)
-
-        # Create the queue and thread pool.
-        if RAMPUP:
-          BAT = int(RAMPUP.split(":")[0])
-          #t_w = int(RAMPUP.split(":")[1]) * 60
-          t_w = int(RAMPUP.split(":")[1])
-        else:
-          BAT = THREADS
-          t_w = 0
-        for i in range(THREADS):
-          t_name = 'T{0:02d}'.format(i+1)
-          th = threading.Thread(target=worker, name=t_name, args=(M_CNT, L_flag, ending, DELAY_START, pacing_time, t_log, DT_ID, t_name))
-          th.daemon = True  # thread dies when main thread (only non-daemon thread) exits.
-          th.start()
-          if t_w != 0 and (i + 1) % BAT == 0 and i < THREADS - 1:
-            time.sleep(t_w)
-
-        TaskQueue.join()       # block until all tasks are done
-
-        # check whether current time exceeds ending time, if not entering into another round of for loop.
-        if L_flag == True:
-          current = time.time()
-          if current > ending:
+      if b_flag:
+        Stats.sink = BinSink(t_log_name + '.bin')
+        print('Statistics logged in binary records: {0}'.format(t_log_name + '.bin'))
+      Stats.start_writer() # stats written by background thread, off the request path.
+      if conns: # greenlets patched in place of threads, bounded connections shared by all users
+        Pools.configure(pool_connections=pool_conns, pool_maxsize=pool_size or conns, pool_block=True)
+      else:
+        Pools.configure(pool_connections=pool_conns, pool_maxsize=pool_size or THREADS) # by default a keep-alive connection per thread to each end point
+      if rate_spec:
+        open_model(fn, rate_spec, THREADS, M_CNT, L_flag, ending, t_log)
+      else:
+        while True:
+          # stuff work items on the queue (in this case, just a tuple of TC id and param list).
+          with open(fn, 'r') as fh:
+            for line in fh:
+              line = line.rstrip('\n').lstrip() + '#'
+              if line.startswith('#') or not line:
+                continue
+              line = line.split('#')[0].strip('\r').rstrip()
+              # put TC id, and context parameters into a queue
+              TaskQueue.put(line)
+
+          # Create the queue and thread pool.
+          if RAMPUP:
+            BAT = int(RAMPUP.split(":")[0])
+            #t_w = int(RAMPUP.split(":")[1]) * 60
+            t_w = int(RAMPUP.split(":")[1])
+          else:
+            BAT = THREADS
+            t_w = 0
+          for i in range(THREADS):
+            t_name = 'T{0:02d}'.format(i+1)
+            th = threading.Thread(target=worker, name=t_name, args=(M_CNT, L_flag, ending, DELAY_START, pacing_time, t_log, DT_ID, t_name, interval))
+            th.daemon = True  # thread dies when main thread (only non-daemon thread) exits.
+            th.start()
+            if t_w != 0 and (i + 1) % BAT == 0 and i < THREADS - 1:
+              time.sleep(t_w)
+
+          TaskQueue.join()       # block until all tasks are done
+
+          # check whether current time exceeds ending time, if not entering into another round of for loop.
+          if L_flag == True:
+            current = time.time()
+            if current > ending:
+              break
+          else:
             break
-        else:
-          break
       m_end = time.time()
+      Stats.stop_writer()
+      if Stats.sink:
+        Stats.sink.close()
       logger.info(' - Elapsed time: {0:.3f}'.format(m_end-m_start))
       print('Elapsed time: {0:.3f} sec.'.format(m_end-m_start))
     ################################# end of multi-threads processing
@@ -8,35 +8,355 @@
 #
 # HISTORY:
 #       version 1.0     05/03/2020              --- program initial
+#       version 1.1     18/10/2026              --- optional binary stats sink, fixed width records with interned strings.
+#       version 1.2     18/10/2026              --- per-thread stats buffers drained by a background writer thread.
+#       version 1.3     18/10/2026              --- monotonic clock anchored to wall clock once, zero padded milli seconds, optional TTFB/body phases.
+#       version 1.4     18/10/2026              --- connection pools shared per (url_root, proxies, verify) across sessions and threads.
+#       version 1.5     18/10/2026              --- merge_stats, merging stats logs of several processes into one in start order.
+#       version 1.6     18/10/2026              --- lag of request start behind its scheduled start (open model), binary layout STATSB03.
+#       version 1.7     18/10/2026              --- Stats.pace, fixed-rate schedule of closed model threads for coordinated omission correction.
+#       version 1.8     18/10/2026              --- Limits, lock free token buckets capping request rate globally, per end point and per TC.
 
 import sys
 import os
 import time
 import requests
+import requests.adapters
 import json
+import struct
+import threading
+import atexit
+import heapq
+import mmap
+import itertools
+import urlparse
+import logging
+from collections import deque
+
+# monotonic clock in ns for durations: perf_counter where available; python 2 has none, clock_gettime(CLOCK_MONOTONIC) is called
+# through ctypes, or QueryPerformanceCounter (time.clock) on windows. time.time, which NTP may step or slew, is the last resort.
+def _posix_clock_ns():
+  import ctypes
+  import ctypes.util
+
+  class timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+  CLOCK_MONOTONIC = 6 if sys.platform == 'darwin' else 1
+  for name in ('c', 'rt'): # clock_gettime lives in librt before glibc 2.17
+    path = ctypes.util.find_library(name)
+    if not path:
+      continue
+    try:
+      clock_gettime = ctypes.CDLL(path, use_errno=True).clock_gettime
+    except (OSError, AttributeError):
+      continue
+    clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
+    clock_gettime.restype = ctypes.c_int
+    if clock_gettime(CLOCK_MONOTONIC, ctypes.byref(timespec())) != 0:
+      continue
+
+    def clock_ns():
+      ts = timespec()
+      clock_gettime(CLOCK_MONOTONIC, ctypes.byref(ts))
+      return ts.tv_sec * 10**9 + ts.tv_nsec
+    return clock_ns
+  return None
+
+if hasattr(time, 'perf_counter_ns'):
+  clock_ns = time.perf_counter_ns
+elif hasattr(time, 'perf_counter'):
+  def clock_ns():
+    return int(time.perf_counter() * 1e9)
+elif sys.platform == 'win32':
+  def clock_ns():
+    return int(time.clock() * 1e9)
+else:
+  clock_ns = _posix_clock_ns()
+  if clock_ns is None:
+    def clock_ns():
+      return int(time.time() * 1e9)
+
+def clock():
+  return clock_ns() / 1e9
+
+# wall clock is read once, time stamps are derived from the monotonic clock hereafter.
+WALL_ANCHOR_NS = int(time.time() * 1e9)
+CLOCK_ANCHOR_NS = clock_ns()
+
+def wall_ns(t_ns):
+  return WALL_ANCHOR_NS + (t_ns - CLOCK_ANCHOR_NS)
+
+def time_str(t_ns):
+  '''
+  epoch ns to HH:MM:SS.mmm in local time.
+  '''
+  return time.strftime("%H:%M:%S", time.localtime(t_ns // 10**9)) + '.{0:03d}'.format(t_ns // 10**6 % 1000)
+
+class BinSink(object):
+  '''
+  structured alternative to the comma joined stats lines. Each request is one fixed width little-endian record:
+    start (epoch ns), end (epoch ns), duration (sec.), size, status code, ids of thread, TC, A_P, url and input strings,
+    TTFB (sec.), body read (sec.) and lag behind scheduled start (sec.), NaN if phases or schedule not recorded.
+  Strings are interned, the id/string table is appended to file.str as json lines. Records are buffered and flushed
+  every batch records or interval seconds, whichever first. stats.py memory-maps the records with the same layout.
+  '''
+  MAGIC = 'STATSB03'
+  REC = struct.Struct('<qqdqiiiiiiddd')
+
+  def __init__(self, file, batch=1000, interval=1.0):
+    self.file = file
+    self.batch = batch
+    self.interval = interval
+    self.lock = threading.Lock()
+    self.ids = {}
+    self.new_strs = []
+    self.buffer = []
+    self.last_flush = time.time()
+    self.fh = open(file, 'wb')
+    self.fh.write(self.MAGIC)
+    self.str_fh = open(file + '.str', 'wb')
+    atexit.register(self.close)
+
+  def _intern(self, s):
+    i = self.ids.get(s)
+    if i is None:
+      i = self.ids[s] = len(self.ids)
+      self.new_strs.append(json.dumps([i, s]))
+    return i
+
+  def write(self, start_ns, end_ns, dur, size, status, thread, tc, a_p, url, input_str, ttfb=float('nan'), body=float('nan'),
+            lag=float('nan')):
+    with self.lock:
+      self.buffer.append(self.REC.pack(start_ns, end_ns, dur, size, status, self._intern(thread), self._intern(tc),
+                                       self._intern(a_p), self._intern(url), self._intern(input_str), ttfb, body, lag))
+      if len(self.buffer) >= self.batch or time.time() - self.last_flush >= self.interval:
+        self._flush()
+
+  def _flush(self):
+    # string table goes first, so a record never refers to an id not yet on disk.
+    if self.new_strs:
+      self.str_fh.write('\n'.join(self.new_strs) + '\n')
+      self.str_fh.flush()
+      self.new_strs = []
+    if self.buffer:
+      self.fh.write(''.join(self.buffer))
+      self.fh.flush()
+      self.buffer = []
+    self.last_flush = time.time()
+
+  def close(self):
+    with self.lock:
+      if not self.fh.closed:
+        self._flush()
+        self.fh.close()
+        self.str_fh.close()
+
+
+class StatsWriter(object):
+  '''
+  takes logging off the request path. Each worker thread appends its stats records to its own deque (append/popleft
+  are atomic, no lock shared between workers), a daemon thread drains all deques every interval seconds and hands the
+  records over to Stats.emit. stop() drains whatever is left, call it before program exits.
+  '''
+  def __init__(self, interval=0.5):
+    self.interval = interval
+    self.local = threading.local()
+    self.buffers = []
+    self.lock = threading.Lock() # only taken when a thread registers its buffer
+    self.stopped = threading.Event()
+    self.thread = threading.Thread(target=self.run, name='StatsWriter')
+    self.thread.daemon = True
+    self.thread.start()
+
+  def put(self, record):
+    buf = getattr(self.local, 'buf', None)
+    if buf is None:
+      buf = self.local.buf = deque()
+      with self.lock:
+        self.buffers.append(buf)
+    buf.append(record)
+
+  def drain(self):
+    with self.lock:
+      buffers = list(self.buffers)
+    for buf in buffers:
+      while buf:
+        Stats.emit(buf.popleft())
+
+  def run(self):
+    while not self.stopped.wait(self.interval):
+      self.drain()
+
+  def stop(self):
+    self.stopped.set()
+    self.thread.join()
+    self.drain()
+
+
+def _text_records(file):
+  '''
+  (day, start time, line) of a text stats log in file order, day counts midnight rollovers so that keys sort across midnight,
+  a line logged late from before the rollover keeps the previous day.
+  '''
+  day, last = 0, None
+  with open(file, 'r') as fh:
+    for line in fh:
+      tod = line.split(',', 2)[1]
+      hour = int(tod[:2])
+      if last is not None and last - hour > 12:
+        day += 1
+      elif last is not None and hour - last > 12:
+        day -= 1
+      last = hour
+      yield (day, tod, line)
+
+def _bin_records(file):
+  '''
+  (start ns, record) of a binary stats log of BinSink in file order, its strings resolved by the file's string table.
+  the records are read through a memory map, not loaded at once.
+  '''
+  strs = {}
+  if os.path.isfile(file + '.str'):
+    with open(file + '.str', 'rb') as fh:
+      for line in fh:
+        i, v = json.loads(line)
+        strs[i] = v
+  with open(file, 'rb') as fh:
+    size = os.fstat(fh.fileno()).st_size
+    if size <= len(BinSink.MAGIC):
+      return
+    data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+  try:
+    for offset in range(len(BinSink.MAGIC), size - BinSink.REC.size + 1, BinSink.REC.size):
+      rec = list(BinSink.REC.unpack_from(data, offset))
+      rec[5:10] = [strs.get(j, '') for j in rec[5:10]]
+      yield (rec[0], rec)
+  finally:
+    data.close()
+
+def merge_stats(files, out):
+  '''
+  merge stats logs written by several processes into one log out ordered by request start, by a streaming merge of the
+  start times: text lines as they are, records of binary logs (BinSink) with strings interned again. merged logs are
+  removed, along with the empty text logs of binary ones.
+  '''
+  files = [f for f in files if os.path.isfile(f)]
+  if not files:
+    return
+  with open(files[0], 'rb') as fh:
+    binary = fh.read(len(BinSink.MAGIC)) == BinSink.MAGIC
+  # each process's log is close to start order already, the stats writer drains buffers every fraction of a second.
+  if binary:
+    sink = BinSink(out)
+    for _, rec in heapq.merge(*[_bin_records(f) for f in files]):
+      sink.write(*rec)
+    sink.close()
+  else:
+    with open(out, 'w') as fh:
+      for _, _, line in heapq.merge(*[_text_records(f) for f in files]):
+        fh.write(line)
+  for f in files:
+    os.remove(f)
+    if os.path.isfile(f + '.str'):
+      os.remove(f + '.str')
+    # the text log of a process with a binary sink, removed unless it holds messages other than stats.
+    text = f[:-len('.bin')] if binary and f.endswith('.bin') else None
+    if text and os.path.isfile(text) and os.path.getsize(text) == 0:
+      os.remove(text)
+
 
 class Stats(object):
   '''
   provide method to dump statistics into log file.
   method show_stats accepts three addtional params to be logged together with statistics: TC - Test case id; INPUT - TC's input params; a_p - additional params
+  statistics go to sink instead of log if a BinSink is assigned, and are written by a background thread once start_writer is called.
+  if phases is True, time to first byte (requests' elapsed) and body read time are appended to each record.
+  if lags is True, lag of request's start behind its scheduled start (I_START kwarg, or Stats.intend on the thread) follows.
   '''
   log = None
   url_root = None
+  sink = None
+  writer = None
+  phases = False
+  lags = False
+  local = threading.local()
+
+  @classmethod
+  def start_writer(cls, interval=0.5):
+    if cls.writer is None:
+      cls.writer = StatsWriter(interval)
+    return cls.writer
+
+  @classmethod
+  def stop_writer(cls):
+    if cls.writer:
+      cls.writer.stop()
+      cls.writer = None
+
+  @classmethod
+  def intend(cls, t_ns):
+    '''
+    scheduled start (clock_ns) of the next request made on this thread.
+    '''
+    cls.local.intended = t_ns
+
+  @classmethod
+  def pace(cls, interval):
+    '''
+    fixed-rate schedule of a closed model thread: the next request is intended interval sec. after the previous intended one,
+    the first one now. returns seconds to wait for it, 0 if the thread is behind the schedule, e.g. after a server stall, in
+    which case the request goes at once and logs its lag. a stall so counts against every request it delayed, not only one.
+    '''
+    now = clock_ns()
+    due = getattr(cls.local, 'due', None)
+    due = now if due is None else due + int(interval * 1e9)
+    cls.local.due = due
+    cls.intend(due)
+    return max(due - now, 0) / 1e9
+
+  @classmethod
+  def emit(cls, record):
+    start_ns, end_ns, size, status, thread, TC, a_p, url, input_str, ttfb, body, lag = record
+    dur = (end_ns - start_ns) / 1e9
+    if cls.sink:
+      nan = float('nan')
+      cls.sink.write(wall_ns(start_ns), wall_ns(end_ns), dur, size, status, thread, TC, a_p, url, input_str,
+                     nan if ttfb is None else ttfb, nan if body is None else body, nan if lag is None else lag)
+    elif cls.log:
+      msg = '{0},{1},{2:.6f},{3},{4},{5},{6},{7},--{8}'.format(time_str(wall_ns(start_ns)), time_str(wall_ns(end_ns)), dur, size, status, TC, a_p, url, input_str)
+      # optional columns are positional, an empty field stands for a value not recorded.
+      if cls.phases or cls.lags:
+        msg += ',' + ('' if ttfb is None else '{0:.6f}'.format(ttfb)) + ',' + ('' if body is None else '{0:.6f}'.format(body))
+      if cls.lags:
+        msg += ',' + ('' if lag is None else '{0:.6f}'.format(lag))
+      if thread == threading.current_thread().name:
+        cls.log.debug(msg)
+      else: # written on behalf of a worker thread, keep the worker's name in %(threadName)s
+        rec = cls.log.makeRecord(cls.log.name, logging.DEBUG, '', 0, msg, None, None)
+        rec.threadName = thread
+        cls.log.handle(rec)
 
   @classmethod
   def show_stats(cls, func):
     def wrapper_func(*args, **kwargs):
-      start = time.time()
-      start_str = time.strftime("%H:%M:%S.{}".format(int(start*1000)%1000), time.localtime(start))
+      intended = kwargs.get('I_START') or getattr(Stats.local, 'intended', None)
+      Stats.local.intended = None # the first request of an iteration is the scheduled one
+      start = clock_ns()
       resp = func(*args, **kwargs)
-      end = time.time()
-      end_str = time.strftime("%H:%M:%S.{}".format(int(end*1000)%1000), time.localtime(end))
-      dur = '{0:.3f}'.format(end-start)
-      TC = kwargs.get("TC", "")
-      input_str = kwargs.get("INPUT", "")
-      a_p = kwargs.get("A_P", "")
-      if Stats.log:
-        Stats.log.debug('{0},{1},{2},{3},{4},{5},{6},{7},--{8}'.format(start_str, end_str, dur, len(resp.content), resp.status_code, TC, a_p, resp.request.url.replace(Stats.url_root, ""), input_str.replace(",", ";")))
+      end = clock_ns()
+      ttfb = body = None
+      lag = (start - intended) / 1e9 if intended else None
+      headers_ns = getattr(resp, 'headers_ns', None)
+      if headers_ns:
+        ttfb = resp.elapsed.total_seconds()
+        body = (end - headers_ns) / 1e9
+      record = (start, end, len(resp.content), resp.status_code, threading.current_thread().name, kwargs.get("TC", ""),
+                kwargs.get("A_P", ""), resp.request.url.replace(Stats.url_root, ""), kwargs.get("INPUT", "").replace(",", ";"), ttfb, body, lag)
+      if Stats.writer:
+        Stats.writer.put(record)
+      else:
+        Stats.emit(record)
       return resp
     return wrapper_func
 
@@ -47,6 +367,145 @@ class Stats(object):
     return foo
 
 
+class Pools(object):
+  '''
+  connection pools (HTTPAdapter) shared by every session to the same (url_root, proxies, verify), so keep-alive connections
+  are reused across threads, iterations and TCs rather than handshaking again for each new Comm_req. urllib3 pools are thread
+  safe, while cookies stay in each Comm_req's own session. pool_maxsize should be no less than the threads sending to the
+  same host, connections beyond it are discarded after use.
+  '''
+  pool_connections = 10 # hosts cached per adapter
+  pool_maxsize = 10 # connections kept alive per host
+  pool_block = False # wait for a free connection instead of opening one beyond pool_maxsize
+  adapters = {}
+  lock = threading.Lock()
+
+  @classmethod
+  def configure(cls, pool_connections=None, pool_maxsize=None, pool_block=None):
+    '''
+    size and blocking of pools created hereafter.
+    '''
+    if pool_connections:
+      cls.pool_connections = pool_connections
+    if pool_maxsize:
+      cls.pool_maxsize = pool_maxsize
+    if pool_block is not None:
+      cls.pool_block = pool_block
+
+  @classmethod
+  def adapter(cls, url_root, proxies=None, verify=True):
+    key = (url_root, tuple(sorted((proxies or {}).items())), verify)
+    with cls.lock:
+      if key not in cls.adapters:
+        cls.adapters[key] = requests.adapters.HTTPAdapter(pool_connections=cls.pool_connections, pool_maxsize=cls.pool_maxsize,
+                                                           pool_block=cls.pool_block)
+      return cls.adapters[key]
+
+  @classmethod
+  def session(cls, url_root, proxies=None, verify=True):
+    session = requests.Session()
+    adapter = cls.adapter(url_root, proxies, verify)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class TokenBucket(object):
+  '''
+  token bucket of rate requests per second holding up to burst tokens, lock free: each acquire takes a ticket from an
+  atomic counter (itertools.count, a single bytecode under the GIL) and ticket n is due at base + n / rate. an idle bucket
+  moves its base forward so that no more than burst tokens are saved up. two threads moving the base at once may let one
+  extra request through, which is the price of no lock on the request path.
+  '''
+  def __init__(self, rate, burst=1):
+    self.rate = rate
+    self.burst = burst
+    self.interval = 1e9 / rate
+    self.depth = (max(burst, 1) - 1) * self.interval
+    self.tickets = itertools.count()
+    self.base = clock_ns()
+
+  def acquire(self):
+    n = next(self.tickets)
+    now = clock_ns()
+    due = self.base + n * self.interval
+    if due < now - self.depth: # tokens unused while idle beyond burst are lost
+      due = now - self.depth
+      self.base = due - n * self.interval
+    if due > now:
+      time.sleep((due - now) / 1e9)
+
+
+class Limits(object):
+  '''
+  process wide request rate limits that every submit_req passes through before it's sent (and timed): a global bucket, and
+  buckets per end point (scheme://host:port of url_root) and per TC id, each set by a rate spec of rate[/burst] in requests
+  per second, e.g. 20/5. share is the number of processes the limits are split across, e.g. -P option of smb_os_sim.py.
+  '''
+  buckets = {}
+  share = 1
+  endpoints = {} # url_root: scheme://host:port, parsed once per url_root
+
+  @staticmethod
+  def endpoint(url):
+    '''
+    scheme://host:port of url, port defaults to the scheme's, so that any url_root on the same server matches.
+    '''
+    u = urlparse.urlsplit(url)
+    return '{0}://{1}:{2}'.format(u.scheme, u.hostname, u.port or {'http': 80, 'https': 443}.get(u.scheme, ''))
+
+  @classmethod
+  def set(cls, key, spec):
+    '''
+    bucket of key, '' for global, url of an end point, or TC id, at rate spec. a bucket already set is kept.
+    '''
+    if '://' in key:
+      key = cls.endpoint(key)
+    if key in cls.buckets:
+      return
+    rate, burst = (spec + '/1').split('/')[:2]
+    if float(rate) <= 0 or int(burst) < 1:
+      raise ValueError('rate limit {0} of {1} must be positive'.format(spec, key or 'all requests'))
+    cls.buckets[key] = TokenBucket(float(rate) / cls.share, max(int(burst) // cls.share, 1))
+
+  @classmethod
+  def configure(cls, specs):
+    '''
+    limits delimited by ",", each rate[/burst] for global, or key=rate[/burst] for an end point or TC, e.g.
+    50,C07=5,http://172.20.60.215:6700=20/5
+    '''
+    for spec in specs.split(','):
+      key, _, rate = spec.rpartition('=')
+      cls.set(key, rate)
+
+  @classmethod
+  def divide(cls, share):
+    '''
+    split the limits evenly across share processes, before the processes are started.
+    '''
+    cls.share = share
+    for key, bucket in cls.buckets.items():
+      cls.buckets[key] = TokenBucket(bucket.rate / share, max(bucket.burst // share, 1))
+
+  @classmethod
+  def acquire(cls, url_root, tc):
+    endpoint = cls.endpoints.get(url_root)
+    if endpoint is None:
+      endpoint = cls.endpoints[url_root] = cls.endpoint(url_root)
+    for key in ('', endpoint, tc):
+      bucket = cls.buckets.get(key)
+      if bucket:
+        bucket.acquire()
+
+  @classmethod
+  def limited(cls, func):
+    def wrapper_func(self, *args, **kwargs):
+      if cls.buckets:
+        cls.acquire(self._url_root, kwargs.get("TC"))
+      return func(self, *args, **kwargs)
+    return wrapper_func
+
+
 class Comm_req(object):
   '''
   communication class used to send requests to server, augmented with logs and stats. 
@@ -58,7 +517,7 @@ class Comm_req(object):
     self.proxies = proxies
     self._cookies = cookies
     self.verify = verify
-    self.session = requests.Session()
+    self.session = Pools.session(url_root, proxies, verify)
     self.request = {"GET": self.session.get, "POST": self.session.post, "PUT": self.session.put, "DELETE": self.session.delete, "OPTIONS": self.session.options}
 
 
@@ -79,12 +538,17 @@ class Comm_req(object):
     self._url_rool = val
     Stats.url_root = val
 
+  @Limits.limited
   @Stats.stats()
   def submit_req(self, uri, method, headers, **kw):
     request = self.request.get(method)
     url = self._url_root + uri
     data = json.dumps(kw.get('data')) if isinstance(kw.get('data'), dict) else kw.get('data')
-    res = request(url, headers=headers, data=data, params=kw.get('params'), files=kw.get('files'), proxies=self.proxies, cookies=self._cookies, verify=self.verify)
+    res = request(url, headers=headers, data=data, params=kw.get('params'), files=kw.get('files'), proxies=self.proxies, cookies=self._cookies, verify=self.verify,
+                  stream=Stats.phases)
+    if Stats.phases: # headers received, time the body read separately.
+      res.headers_ns = clock_ns()
+      res.content
     return res
 
 
@@ -97,7 +561,7 @@ class Comm_req2(object):
     self.proxies = proxies
     self._cookies = cookies
     self.verify = verify
-    self.session = requests.Session()
+    self.session = Pools.session(url_root, proxies, verify)
     self.request = {"GET": self.session.get, "POST": self.session.post, "PUT": self.session.put, "DELETE": self.session.delete, "OPTIONS": self.session.options}
 
   @property
@@ -116,6 +580,7 @@ class Comm_req2(object):
   def url_root(self, val):
     self._url_rool = val
 
+  @Limits.limited
   def submit_req(self, uri, method, headers, **kw):
     request = self.request.get(method)
     url = self._url_root + uri
@@ -0,0 +1,165 @@
+#!/usr/bin/python2.7 -tt
+
+# AUTHOR:       Gu Jian Min
+# DATE:         18/10/2026
+# PROGRAM:      scheduler.py
+# PURPOSE:
+#               open workload model for the drivers: requests dispatched at target arrival rates from a timer wheel,
+#               independent of response times, each request stamped with its scheduled start to log scheduling lag.
+#
+# HISTORY:
+#       version 1.0     18/10/2026              --- program initial
+#
+version = 'v1.0'
+
+import time
+import random
+import threading
+import traceback
+import Queue
+from new_comm_req import Stats, clock_ns
+
+RATE_SPECS = '''
+           const/r             r requests per second, evenly spaced, e.g. const/50
+           poisson/r           r requests per second on average, exponential inter-arrival times, e.g. poisson/50
+           step/r/inc/secs     r requests per second, raised by inc every secs seconds, e.g. step/10/10/60
+           ramp/r0/r1/secs     linearly from r0 to r1 requests per second over secs seconds, r1 thereafter, e.g. ramp/0/100/300
+'''
+
+
+def rate_fn(spec):
+  '''
+  returns the rate (requests per second) as a function of seconds since start, whether arrivals are poisson, and seconds
+  since start after which the rate holds constant, of a rate spec. rates are not negative and not zero throughout.
+  '''
+  fields = spec.split('/')
+  shape = fields[0]
+  try:
+    a = [float(x) for x in fields[1:]]
+    if shape in ('const', 'poisson') and len(a) == 1 and a[0] > 0:
+      return (lambda t: a[0]), shape == 'poisson', 0.0
+    if shape == 'step' and len(a) == 3 and min(a) >= 0 and a[0] + a[1] > 0 and a[2] > 0:
+      return (lambda t: a[0] + a[1] * int(t // a[2])), False, 0.0 if a[1] == 0 else float('inf')
+    if shape == 'ramp' and len(a) == 3 and min(a) >= 0 and a[0] + a[1] > 0 and a[2] > 0:
+      return (lambda t: a[0] + (a[1] - a[0]) * min(t / a[2], 1.0)), False, a[2]
+  except ValueError:
+    pass
+  raise ValueError('unsupported rate spec: {0}, supported ones are:{1}'.format(spec, RATE_SPECS))
+
+def arrival_times(spec, start_ns, end_ns=None, count=None):
+  '''
+  scheduled arrival times (clock_ns) of a rate spec from start_ns on, until end_ns or count arrivals, or the rate stays 0.
+  '''
+  rate, poisson, steady = rate_fn(spec)
+  t = 0.0
+  n = 0
+  while count is None or n < count:
+    due = start_ns + int(t * 1e9)
+    if end_ns is not None and due >= end_ns:
+      return
+    r = rate(t)
+    if r <= 0: # e.g. ramp from or down to 0, nothing to send in the meantime
+      if t >= steady:
+        return
+      t += 0.1
+      continue
+    yield due
+    n += 1
+    t += random.expovariate(r) if poisson else 1.0 / r
+
+
+class TimerWheel(object):
+  '''
+  hashed timer wheel: a ring of slots of tick seconds, a timer lands in the slot of its due tick and one due beyond a turn of
+  the wheel waits there for its round. scheduling and expiry cost the same however many timers are pending.
+  '''
+  def __init__(self, tick=0.001, slots=1024):
+    self.tick = tick
+    self.tick_ns = int(tick * 1e9)
+    self.slots = [[] for _ in range(slots)]
+    self.current = clock_ns() // self.tick_ns
+    self.pending = 0
+    self.lock = threading.Lock()
+
+  def schedule(self, due_ns, item):
+    with self.lock:
+      tick = max(due_ns // self.tick_ns, self.current) # overdue fires at the current tick
+      self.slots[tick % len(self.slots)].append((tick, due_ns, item))
+      self.pending += 1
+
+  def advance(self, now_ns):
+    '''
+    expire the timers of all ticks up to now_ns, returned as (due_ns, item) in due order.
+    '''
+    due = []
+    with self.lock:
+      while self.current <= now_ns // self.tick_ns:
+        i = self.current % len(self.slots)
+        if self.slots[i]:
+          due += [x for x in self.slots[i] if x[0] <= self.current]
+          self.slots[i] = [x for x in self.slots[i] if x[0] > self.current]
+        self.current += 1
+      self.pending -= len(due)
+    due.sort(key=lambda x: x[1])
+    return [(due_ns, item) for _, due_ns, item in due]
+
+
+class OpenModel(object):
+  '''
+  open workload model: each added work (a function making one request iteration) is dispatched at the arrival times of its
+  rate spec onto a pool of sender threads, whatever the response times, so that the offered load holds as the server slows
+  down. a sender stamps the scheduled start on its thread (Stats.intend) and the request logs its lag behind the schedule,
+  lag grows once all senders are busy, i.e. the driver itself can't keep up with the target rate.
+  '''
+  def __init__(self, senders, tick=0.001, slots=1024):
+    self.senders = senders
+    self.wheel = TimerWheel(tick, slots)
+    self.queue = Queue.Queue()
+
+  def add(self, spec, work, end_ns=None, count=None):
+    '''
+    schedule work at the rate of spec from now on, until end_ns (clock_ns) or count arrivals.
+    '''
+    self._next(arrival_times(spec, clock_ns(), end_ns, count), work)
+
+  def _next(self, arrivals, work):
+    # arrivals are generated one at a time, pending timers are bounded by the number of works.
+    due = next(arrivals, None)
+    if due is not None:
+      self.wheel.schedule(due, (arrivals, work))
+
+  def send(self):
+    while True:
+      item = self.queue.get()
+      if item is None:
+        self.queue.task_done()
+        return
+      due_ns, work = item
+      try:
+        Stats.intend(due_ns)
+        work()
+      except Exception:
+        traceback.print_exc()
+      finally:
+        self.queue.task_done()
+
+  def run(self, first=0):
+    '''
+    dispatch until all schedules are done and sent, senders are named T<first + 1> onwards as worker threads.
+    '''
+    threads = []
+    for i in range(self.senders):
+      th = threading.Thread(target=self.send, name='T{0:02d}'.format(first + i + 1))
+      th.daemon = True
+      th.start()
+      threads.append(th)
+    while self.wheel.pending:
+      time.sleep(self.wheel.tick)
+      for due_ns, (arrivals, work) in self.wheel.advance(clock_ns()):
+        self.queue.put((due_ns, work))
+        self._next(arrivals, work)
+    self.queue.join()
+    for th in threads:
+      self.queue.put(None)
+    for th in threads:
+      th.join()
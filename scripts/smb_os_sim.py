@@ -11,6 +11,14 @@
 #       version 1.0     26/09/2017              --- program initial
 #       version 3.0     20/08/2020              --- major enhancement.
 #       version 3.1     08/09/2020              --- introduced esso login function
+#       version 3.2     18/10/2026              --- introduced -b option, logging statistics in binary records.
+#       version 3.3     18/10/2026              --- statistics written by background thread in multi-threads mode.
+#       version 3.4     18/10/2026              --- monotonic clock for response time, introduced -H option to record response phases.
+#       version 3.5     18/10/2026              --- keep-alive connections pooled per end point and shared by all threads, sized by -C option.
+#       version 3.6     18/10/2026              --- introduced -P option, sharding tc_file and threads across processes.
+#       version 3.7     18/10/2026              --- introduced -T option, open workload model at target arrival rates.
+#       version 3.8     18/10/2026              --- introduced -x option, fixed-rate threads logging lag behind schedule (coordinated omission).
+#       version 3.9     18/10/2026              --- introduced -r option, process wide rate limits globally, per end point and per TC.
 #
 # Note:
 #      [1] For those APIs which require token, follow below steps to get token:
@@ -19,7 +27,7 @@
 #          step 2: after successful login, click herewith url to get session id: https://onlinestore-uat.business.starhub.com/content/smb/en/dev/login/status.txt
 #          step 3: searching for keyword SM_SERVERSESSIONID to find session id. e.g. wOrPiXSojaKLijDCIy1P5jByddI=
 #
-version = 'v3.1'
+version = 'v3.9'
 
 import sys
 import os
@@ -31,10 +39,13 @@ import json
 import getopt
 import logging
 import threading
+import itertools
 import Queue
+import multiprocessing
 from copy import deepcopy
 #from comm_req import Comm_req, Comm_req2
-from new_comm_req import Comm_req, Comm_req2
+from new_comm_req import Comm_req, Comm_req2, Stats, BinSink, Pools, Limits, clock, clock_ns, merge_stats
+from scheduler import OpenModel, rate_fn, RATE_SPECS
 import urllib
 from esso_login import login
 
@@ -46,7 +57,7 @@ TaskQueue = Queue.Queue()
 myApp = os.path.basename(sys.argv[0]).split('.')[0] + '.log' # log file name
 workingDir = os.getcwd() + '/' # creating log file in current working directory
 logger = logging.getLogger(myApp)
-l_fh = logging.FileHandler(workingDir + myApp)
+l_fh = logging.FileHandler(workingDir + myApp, delay=True) # created on first record, not on import e.g. by har_ana.py -t
 formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
 l_fh.setFormatter(formatter)
 logger.addHandler(l_fh) 
@@ -63,7 +74,7 @@ def usage(arg):
   out_string = '''
 Simulating SMB OS App to interact with ESB Layer(FAPI).
 
-Usage 1: {0} [-e env] [-U] [-d] [-L min] [-w sec] [-M th_num] [-B rampup] [-c num] -f tc_file
+Usage 1: {0} [-e env] [-U] [-d] [-L min] [-w sec] [-x ms] [-r limits] [-M th_num] [-C pools] [-P procs] [-T rate] [-B rampup] [-c num] [-b] [-H] -f tc_file
 Usage 2: {0} [-e env] [-U] [-d] -s tc_id params
 Usage 3: {0} -S
 Usage 4: {0} -A json_f [Y/N]
@@ -73,15 +84,40 @@ where
       env: one of the supported environment, i.e. UAT, only one environment exists for now.
        -M: a flag to instruct program to run in multi-threads.
    th_num: indicate number of threads.
-       -B: ramp up indicator.
+       -C: a flag to instruct program to size the keep-alive connection pools shared by all threads by hereafter pools.
+    pools: pool_connections[:pool_maxsize], i.e. end points (hosts) cached per pool and connections kept alive per end point,
+           e.g. 10:50. pool_maxsize defaults to the threads of the process; connections beyond it are discarded after use.
+       -P: a flag to instruct program to spread the th_num threads and the lines of tc_file across hereafter procs processes, used
+           together with -M to use all CPU cores. each process logs its own statistics, merged in start time order into one log
+           when all processes are done. ramp up of -B applies in each process.
+    procs: number of processes, e.g. 4, usually the number of CPU cores.
+       -T: a flag to instruct program to run an open workload model instead of th_num looping threads, used together with -M.
+           requests of each line of tc_file are sent at hereafter target arrival rate whatever the response times, by th_num
+           sender threads, the line runs for -L min or -c num requests. each stats record is appended with its lag (sec.) behind
+           the scheduled start, i.e. sender threads short of the rate; -w and -B are ignored.
+     rate: arrival rate spec of each line, one of below, it can be overwritten per line by the 4th +a param,
+           e.g. Z09,xyz@hotmail.com,98001010,+a,:::poisson/20{1}       -B: ramp up indicator.
    rampUp: ramp up criterion, in the form of num:seconds, e.g. 5:20 which means instantiating 5 threads every 20 seconds.
        -c: a flag to instruct program to make num of requests with same set of data in tc_file.
       num: a number e.g. 10
+       -b: a flag to instruct program to log statistics as binary records into log_file.bin instead of text lines, used together with -M.
+           the records can be fed to stats.py the same way as text log file.
+       -H: a flag to instruct program to record response phases, i.e. time to first byte and body read time, appended to each stats record.
        -f: a flag to instruct program to retrieve TC id as well as TC params from hereafter input file, e.g. tc_file.
   tc_file: a file contains list of test cases, in the form of tc_id, context parameters, e.g. Z09,xyz@hotmail.com,98001010 
            per test case dependant params descriptions, check through: {0} -S option.
        -w: a flag to instruct program to wait some seconds before submitting next request.
       sec: number of seconds to wait.
+       -x: a flag to instruct program to start each thread's iterations at a fixed rate, every hereafter ms milli seconds, in place
+           of the pacing time of -w, used together with -M. an iteration delayed past its intended start, e.g. by a server stall,
+           starts at once and its stats record is appended with its lag (sec.) behind the intended start; stats.py reports
+           percentiles corrected by the lag (coordinated omission) next to the raw ones.
+       ms: intended interval between iterations of a thread, i.e. expected response time plus pacing, e.g. 1200.
+       -r: a flag to instruct program to cap the request rate of the whole process by hereafter limits, whatever the threads.
+   limits: rate limits delimited by ",", rate[/burst] for all requests, or key=rate[/burst] for the requests of an end point
+           (scheme://host:port, any path is ignored) or a TC, in requests per second with up to burst requests at once (default
+           to 1), e.g. 50,C07=5,https://esb-uat:8443=20/5
+           a TC's limit can be set by the 5th +a param in tc_file as well, e.g. Z09,xyz@hotmail.com,98001010,+a,::::5
        -L: a flag to instruct program to run x number of minutes.
       min: number of minutes.
        -s: request to execute one single test case determined by hereafter tc_id
@@ -98,7 +134,7 @@ where
 
 Note: 1) For authorized TC, the 2nd parameter of TC dependent params is token or password.
 
-'''.format(arg)
+'''.format(arg, RATE_SPECS)
   print(out_string)
 
 # dump scenarios' descriptions
@@ -2232,10 +2268,10 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
     # login
     step += 1
     augmented_print('\nStep {0}: login'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     w_list = [':'.join([u_id, _brn]), passwd]
     u_token = X00_login(tc_id, context, w_list, verbose=0)
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if u_token is None:
@@ -2251,12 +2287,12 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   # get billing account info
   step += 1
   augmented_print('\nStep {0}: get billing account info'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, ba]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     billing_acct = common_func('A02', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if billing_acct is None:
@@ -2270,13 +2306,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   # get commercial offers
   step += 1
   augmented_print('\nStep {0}: get commercial offers'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = False
   w_list = ['Mobile', bundleId]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     #commercialOffers = common_func('P03', context, w_list, verbose=False)
     commercialOffers = common_func('P03', context, w_list, verbose=False, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if commercialOffers is None:
@@ -2289,13 +2325,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   # get candidate vas list
   step += 1
   augmented_print('\nStep {0}: get list of VASes under given plan'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, plan_pn]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     #candidate_vas_list = common_func('P05', context, w_list, verbose=0)
     candidate_vas_list = common_func('P05', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if candidate_vas_list is None:
@@ -2310,12 +2346,12 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
     # get Mobile resource
     step += 1
     augmented_print('\nStep {0}: get Mobile resource'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = False
     p_list = ["3G TriSIM Card", "voice", "1"]
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       res = common_func('G02', context, p_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if res is None or len(res) == 0:
@@ -2350,13 +2386,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   time.sleep(think_time)
   augmented_print('\nStep {0}: put promo pick.'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, 'promo', json.dumps(promoPick)]
   #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2376,13 +2412,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   time.sleep(think_time)
   augmented_print('\nStep {0}: put subscription picks.'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, 'subscription', json.dumps(subsPick)]
   #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2402,13 +2438,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   time.sleep(think_time)
   augmented_print('\nStep {0}: put plan pick.'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, 'product', json.dumps(planPick)]
   #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2429,13 +2465,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     time.sleep(think_time)
     augmented_print('\nStep {0}: put device pick.'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, 'device', json.dumps(devPick)]
     #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -2456,13 +2492,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     time.sleep(think_time)
     augmented_print('\nStep {0}: put vas pick.'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, 'product', json.dumps(vasPick)]
     #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -2483,12 +2519,12 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   time.sleep(think_time)
   augmented_print('\nStep {0}: put resource pick.'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, 'resource', json.dumps(resPick)]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2505,13 +2541,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: get basket.'.format(step), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = ['NA', u_token]
   #ret = common_func('B01', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B01', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2529,13 +2565,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: check basket/totals.'.format(step), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, basketId]
   #ret = common_func('B06', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B06', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2553,13 +2589,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: check subscription eligibility.'.format(step), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, subsPickId]
   #ret = common_func('B14', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B14', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2589,13 +2625,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: check appointment slots.'.format(step), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, app_dt, 'Mobile']
   #ret = common_func('L01', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('L01', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None or len(ret) == 0:
@@ -2614,13 +2650,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: confirm appointment date.'.format(step), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, subsPickId, '%'.join([app_dt, '-'.join([slot_start, slot_end])])]
   #ret = common_func('L02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('L02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None or len(ret) == 0:
@@ -2637,13 +2673,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: update billdeliverymethod.'.format(step), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, basketId, promoPickId, subsPickId, "Electronic Invoice"]
   #ret = common_func('B12', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B12', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2659,13 +2695,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   augmented_print('\nStep {0}: update collectionInfo into basket.'.format(step), suppress=suppress)
   collectInfo = collectInfoPayload(billing_acct["billingAddress"], app_dt, ' - '.join([slot_start, slot_end]), 'delivery', email=u_id)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, json.dumps(collectInfo)]
   #ret = common_func('B13', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B13', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2682,13 +2718,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: basket/eligibility.'.format(step), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token]
   #ret = common_func('B03', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B03', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None or ret.get("basketStatus") == "Invalid":
@@ -2705,13 +2741,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: check basket status.'.format(step), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, basketId]
   #ret = common_func('B05', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B05', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None or ret == "INVALID":
@@ -2728,13 +2764,13 @@ def S04_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: contractdocs/{1}/scannedFiles.'.format(step, basketId), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, basketId]
   #ret = common_func('B09', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B09', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2800,10 +2836,10 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
     # login
     step += 1
     augmented_print('\nStep {0}: login'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     w_list = [':'.join([u_id, _brn]), passwd]
     u_token = X00_login(tc_id, context, w_list, verbose=0)
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if u_token is None:
@@ -2819,12 +2855,12 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
   # get billing account info
   step += 1
   augmented_print('\nStep {0}: get billing account info'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, ba]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     billing_acct = common_func('A02', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if billing_acct is None:
@@ -2838,13 +2874,13 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
   # get commercial offers
   step += 1
   augmented_print('\nStep {0}: get commercial offers'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = False
   w_list = ['Broadband', bundleId, suppInfo]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     #commercialOffers = common_func('P03', context, w_list, verbose=False)
     commercialOffers = common_func('P03', context, w_list, verbose=False, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if commercialOffers is None:
@@ -2857,13 +2893,13 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
   # get candidate vas list
   step += 1
   augmented_print('\nStep {0}: get list of VASes under given plan'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, plan_pn]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     #candidate_vas_list = common_func('P05', context, w_list, verbose=0)
     candidate_vas_list = common_func('P05', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if candidate_vas_list is None:
@@ -2876,10 +2912,10 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
   # get service address info.
   step += 1
   augmented_print('\nStep {0}: get service address info'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = False
   svc_addr_info = get_svc_addr_info(context, postalCode, samAddressId, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if svc_addr_info is None:
@@ -2925,13 +2961,13 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   time.sleep(think_time)
   augmented_print('\nStep {0}: put promo pick.'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, 'promo', json.dumps(promoPick)]
   #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2951,13 +2987,13 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   time.sleep(think_time)
   augmented_print('\nStep {0}: put subscription picks.'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, 'subscription', json.dumps(subsPick)]
   #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -2977,13 +3013,13 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   time.sleep(think_time)
   augmented_print('\nStep {0}: put plan pick.'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, 'product', json.dumps(planPick)]
   #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -3004,13 +3040,13 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     time.sleep(think_time)
     augmented_print('\nStep {0}: put device pick.'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, 'device', json.dumps(devPick)]
     #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -3031,13 +3067,13 @@ def S05_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     time.sleep(think_time)
     augmented_print('\nStep {0}: put vas pick.'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, 'product', json.dumps(vasPick)]
     #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -3117,10 +3153,10 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     # login
     step += 1
     augmented_print('\nStep {0}: login'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     w_list = [':'.join([u_id, _brn]), passwd]
     u_token = X00_login(tc_id, context, w_list, verbose=0)
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if u_token is None:
@@ -3135,12 +3171,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
   # get customer info
   step += 1
   augmented_print('\nStep {0}: get customer info'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     cus_info = common_func('A01', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if cus_info is None:
@@ -3168,12 +3204,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
   # get UC group info
   step += 1
   augmented_print('\nStep {0}: get UC group info'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [':'.join([u_id, docNum]), u_token, 'BRN_SME']
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ucGrp_info = common_func('A08', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ucGrp_info is None:
@@ -3194,12 +3230,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     # get billing account info
     step += 1
     augmented_print('\nStep {0}: get billing account info'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, ba]
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       billing_acct = common_func('A02', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if billing_acct is None:
@@ -3214,12 +3250,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     # get address by postalCode and samAddrId
     step += 1
     augmented_print('\nStep {0}: get address info'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = False
     w_list = [postalCode]
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('J01', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -3238,12 +3274,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
   # get commercial offers
   step += 1
   augmented_print('\nStep {0}: get commercial offers'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = False
   w_list = ['SmartUC', bundleId]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     commercialOffers = common_func('P03', context, w_list, verbose=False, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if commercialOffers is None:
@@ -3256,12 +3292,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
   # get candidate vas list
   step += 1
   augmented_print('\nStep {0}: get list of VASes under given plan'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, plan_pn, ':'.join([campaignId, bundleId])]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     candidate_vas_list = common_func('P05', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if candidate_vas_list is None:
@@ -3274,12 +3310,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
   # get additional candidate vas list
   step += 1
   augmented_print('\nStep {0}: get list of VASes under given plan'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, '', ':'.join([campaignId, bundleId])]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     addi_candidate_vas_list = common_func('P05', context, w_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if candidate_vas_list is None:
@@ -3294,12 +3330,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     # get number resource
     step += 1
     augmented_print('\nStep {0}: get number resource'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = False
     p_list = [':'.join([u_id, '', '', str(num_lines)])]
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       res = common_func('A09', context, p_list, verbose=0, req=req, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if res is None or len(res[0]["resourceInfoList"]) == 0:
@@ -3330,13 +3366,13 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     time.sleep(think_time)
     augmented_print('\nStep {0}: put promo pick.'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, 'promo', json.dumps(promoPick)]
     #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -3356,13 +3392,13 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     time.sleep(think_time)
     augmented_print('\nStep {0}: put subscription picks.'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, 'subscription', json.dumps(subsPick)]
     #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -3382,13 +3418,13 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     time.sleep(think_time)
     augmented_print('\nStep {0}: put plan pick.'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, 'product', json.dumps(planPick)]
     #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -3409,12 +3445,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     time.sleep(think_time)
     augmented_print('\nStep {0}: put resource pick.'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, 'resource', json.dumps(resPick)]
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -3435,13 +3471,13 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
       step += 1
       time.sleep(think_time)
       augmented_print('\nStep {0}: put device pick.'.format(step), suppress=suppress)
-      start = time.time()
+      start = clock()
       context['u_flag'] = True
       w_list = [u_id, u_token, 'device', json.dumps(devPick)]
       #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
       with RedirectStdStreams(stdout=devnull, stderr=devnull):
         ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-      end = time.time()
+      end = clock()
       dur = '{0:.3f}'.format(end-start)
       augmented_print('Duration: {0}'.format(dur), suppress=suppress)
       if ret is None:
@@ -3462,13 +3498,13 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
       step += 1
       time.sleep(think_time)
       augmented_print('\nStep {0}: put vas pick.'.format(step), suppress=suppress)
-      start = time.time()
+      start = clock()
       context['u_flag'] = True
       w_list = [u_id, u_token, 'product', json.dumps(vasPick)]
       #ret = common_func('B02', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
       with RedirectStdStreams(stdout=devnull, stderr=devnull):
         ret = common_func('B02', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-      end = time.time()
+      end = clock()
       dur = '{0:.3f}'.format(end-start)
       augmented_print('Duration: {0}'.format(dur), suppress=suppress)
       if ret is None:
@@ -3487,13 +3523,13 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
       step += 1
       augmented_print('\nStep {0}: get basket.'.format(step), suppress=suppress)
       time.sleep(think_time)
-      start = time.time()
+      start = clock()
       context['u_flag'] = True
       w_list = ['NA', u_token]
       #ret = common_func('B01', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
       with RedirectStdStreams(stdout=devnull, stderr=devnull):
         ret = common_func('B01', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-      end = time.time()
+      end = clock()
       dur = '{0:.3f}'.format(end-start)
       augmented_print('Duration: {0}'.format(dur), suppress=suppress)
       if ret is None:
@@ -3511,13 +3547,13 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     augmented_print('\nStep {0}: check basket/totals.'.format(step), suppress=suppress)
     time.sleep(think_time)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, basketId]
     #ret = common_func('B06', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B06', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('*Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -3537,7 +3573,7 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   time.sleep(think_time)
   augmented_print('\nStep {0}: update/create UC Group.'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   if ucGrpId:
     w_list = [u_id, u_token, ucGrpId]
@@ -3546,7 +3582,7 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
   #ret = common_func('B07', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B07', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -3561,13 +3597,13 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
   step += 1
   augmented_print('\nStep {0}: check subscription eligibility.'.format(step), suppress=suppress)
   time.sleep(think_time)
-  start = time.time()
+  start = clock()
   context['u_flag'] = True
   w_list = [u_id, u_token, subsPickId]
   #ret = common_func('B14', context, w_list, verbose=2, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     ret = common_func('B14', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if ret is None:
@@ -3598,12 +3634,12 @@ def S06_func(tc_id, cxt, p_list, verbose, **kw):
     step += 1
     time.sleep(think_time)
     augmented_print('\nStep {0}: upload scanned contract documents.'.format(step), suppress=suppress)
-    start = time.time()
+    start = clock()
     context['u_flag'] = True
     w_list = [u_id, u_token, basketId]
     with RedirectStdStreams(stdout=devnull, stderr=devnull):
       ret = common_func('B09', context, w_list, verbose=0, req=req, suppress_params=True, A_P='_'.join([prefix, '{0:02d}'.format(step)]))
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
     if ret is None:
@@ -3659,12 +3695,12 @@ def S09_func(tc_id, cxt, p_list, verbose, **kw):
   # get all the devices of a given combination of campaignId and bundleId
   step += 1
   augmented_print('\nStep {0}: get all the devices of a given combination of campaignId and bundleId'.format(step), suppress=suppress)
-  start = time.time()
+  start = clock()
   context['u_flag'] = False
   w_list = [':'.join([campaignId,bundleId])]
   with RedirectStdStreams(stdout=devnull, stderr=devnull):
     device_list = common_func('D02', context, w_list, verbose=0)
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   augmented_print('Duration: {0}'.format(dur), suppress=suppress)
   if device_list is None:
@@ -3682,7 +3718,7 @@ def S09_func(tc_id, cxt, p_list, verbose, **kw):
       continue
     step += 1
     augmented_print('\nStep {0}: check through {1}, {2}, {3}, {4}'.format(step, d["deviceBrand"], d["devicePartNum"], d["deviceName"], devType), suppress=suppress)
-    start = time.time()
+    start = clock()
 
     devStockCode_list = []
     for v in d["deviceVariants"]["deviceVariant"]:
@@ -3696,7 +3732,7 @@ def S09_func(tc_id, cxt, p_list, verbose, **kw):
       if i["stockStatus"] != "OUT_OF_STOCK":
         print('{0} -- {1}'.format(i["deviceStockCode"], i["stockStatus"]))
 
-    end = time.time()
+    end = clock()
     dur = '{0:.3f}'.format(end-start)
     augmented_print('Duration: {0}'.format(dur), suppress=suppress)
 
@@ -3750,14 +3786,14 @@ def common_func(tc_id, context, param_list, verbose, **kw):
     if context['etag']:
       headers['If-None-Match'] = context['etag']
 
-  start = time.time()
+  start = clock()
   for i in range(Tries):
     #r = req.submit_req(res, method, headers, payload, query_str_fl(tc_id), TC=tc_id, INPUT=params_str)
     r = req.submit_req(res, method, headers, data=payload, params=querystr, TC=tc_id, INPUT=params_str, A_P=A_P)
     if r.status_code != 202:
       break
     time.sleep(fibonacci(i+1))
-  end = time.time()
+  end = clock()
   dur = '{0:.3f}'.format(end-start)
   etag = ''
   ret = None
@@ -4023,7 +4059,7 @@ def R01_func(tc_id, cxt, p_list, verbose):
 def thread_logger(file, threads, appendix):
   logger = logging.getLogger(appendix)
   logger.setLevel(logging.DEBUG)
-  fh = logging.FileHandler(file + '_M' + str(threads) + '.' + appendix)
+  fh = logging.FileHandler(file + '_M' + str(threads) + '.' + appendix, delay=True) # not created unless written, e.g. -b option
   fmt = '%(threadName)s,%(message)s'
   formatter = logging.Formatter(fmt)
   fh.setFormatter(formatter)
@@ -4070,8 +4106,106 @@ def common_worker(req, res, headers, payload, method, log, tc_id, param_list, re
     time.sleep(fibonacci(i+1))
 
 
+def prepare(item_x, log, t_name, ctl, concurrent=False):
+  '''
+  prepares the work of one tc_file line, i.e. a function making one iteration of its requests, and returns it with the line's
+  rate spec, None if the line has none; or None if login of the line fails. ctl is the execution control of the thread: pacing_time,
+  think_t, lFlag, ending and cnt, which are overwritten in place by the line's thread level params, see worker. concurrent is set
+  by the open model, whose work runs on several sender threads at once.
+  '''
+  tc_id = item_x.split(',')[0].lstrip().rstrip()
+  headers = get_headers(tc_id)
+  retry = get_202_retry(tc_id)
+  do_work = get_do_worker(tc_id)
+  param_list = item_x.split(',')[1:]
+
+  method, res, auth, analyser = get_res_n_met(tc_id, param_list) # get respective request method, resource name and auth flag
+  payload = None
+
+  # integrate with dynatrace
+  headers['x-dynatrace-test'] += ';PC={0};TSN={1};VU={2}'.format(res, tc_id, t_name)
+
+  a_p = "N" # addtional parameter to support statisticss, to sort out different cases.
+  rate = None
+  if len(param_list) >= 2 and param_list[-2] == '+a':
+    a_param_list = (param_list[-1] + ":::::").split(":")
+    #print(a_param_list)
+    # 1st param to overwrite global pacing_time param
+    if a_param_list[0]:
+      ti_dict = dict(enumerate(a_param_list[0].split(";"))) # pacing time and think time override control
+      if ti_dict.get(0, ''): # pacing time
+        ctl['pacing_time'] = int(ti_dict.get(0)) / 1000.0
+      if ti_dict.get(1, ''): # think time
+        ctl['think_t'] = int(ti_dict.get(1)) / 1000.0
+    # 2nd additional param consists of 3 control elements, 1) override excution duration; 2) override number of execution count;
+    # override globle -U flag.
+    if a_param_list[1]:
+      ctl_dict = dict(enumerate(a_param_list[1].split(";")))
+      #print(ctl_dict)
+      if ctl_dict.get(2, ''): # token overwritten control
+        if ctl_dict.get(2, '') == 'U':
+          CONTEXT['u_flag'] = True
+        else:
+          CONTEXT['u_flag'] = False
+        #print("U override")
+      if ctl_dict.get(0, ''): # execution duration overwritten control
+        ctl['ending'] = time.time() + float(int(ctl_dict.get(0)) * 60) # set estimated ending time.
+        ctl['lFlag'] = True # duration dominant
+      if ctl_dict.get(1, '') and not ctl_dict.get(0, '') : # number of execution count overwritten control
+        ctl['cnt'] = int(ctl_dict.get(1))
+        ctl['lFlag'] = False # count dominant
+
+    param_list = param_list[:-2]
+    a_p = a_param_list[2] if len(a_param_list[2]) > 0 else "N"
+    # 4th param, arrival rate of this line in open model (-T option)
+    rate = a_param_list[3] or None
+    # 5th param, rate limit of this TC, see -r option
+    if a_param_list[4]:
+      try:
+        Limits.set(tc_id, a_param_list[4])
+      except ValueError as err:
+        print('Invalid rate limit of {0}: {1}'.format(tc_id, err))
+
+  req = Comm_req(log, get_end_point(tc_id), proxies=PROXIES)
+  if auth == 'Y':
+    if CONTEXT['u_flag'] or isToken(param_list[1]):
+      u_token = param_list[1]
+    else:
+      u_token = X00_login(tc_id, CONTEXT, param_list, verbose=0)
+      param_list[1] = u_token
+    headers['authorization'] = u_token
+    if u_token is None:
+      return None
+
+  if method: # if method is None, it means pseudo TC
+    payload = get_payload(tc_id, param_list, query_str_fl(tc_id)) # get respective TC payload
+    url = get_end_point(tc_id) + res
+
+  param_list.append(1) # param used as a flip and flap switch to some TCs.
+  think_t = ctl['think_t']
+  if not concurrent:
+    # closed model: one thread runs the line, the same headers and params go to every iteration, so state do_work keeps in
+    # them, e.g. a token or a cookie, carries over to the next one.
+    def work():
+      param_list[-1] ^= 1
+      do_work(req, res, headers, payload, method, log, tc_id, param_list, retry, a_p, think_t)
+    return work, rate
+
+  flips = itertools.count()
+  # work runs on several sender threads at once in open model: each thread has its own Comm_req (session and cookies),
+  # each dispatch its own copy of params and headers.
+  local = threading.local()
+  local.req = req
+  def work():
+    if not hasattr(local, 'req'):
+      local.req = Comm_req(log, get_end_point(tc_id), proxies=PROXIES)
+    params = param_list[:]
+    params[-1] = next(flips) % 2
+    do_work(local.req, res, dict(headers), payload, method, log, tc_id, params, retry, a_p, think_t)
+  return work, rate
+
 # the worker thread pulls an item from the queue and processes it
-def worker(CNT, L_flag, ENDING, DELAY_START, PACING_TIME, log, dt_id, t_name):
+def worker(CNT, L_flag, ENDING, DELAY_START, PACING_TIME, log, dt_id, t_name, INTERVAL=0):
   '''
   if L_flag is True, then execution control is duration dominant otherwise it is count dominant.
   Duration dominant has higher priority if both L_flag and CNT are specified.
@@ -4079,97 +4213,117 @@ def worker(CNT, L_flag, ENDING, DELAY_START, PACING_TIME, log, dt_id, t_name):
   pacing time for each iteration, and overwritten global execution duration and reset the execution duration to 30 mins for this thread,
   the U flag to tell program to treat hub_id as token for this tread;
   or ;3000:;20, which means overwritten global setting and execute this thread 20 times, it takes 3000 milli seconds think time.
-  thread level param is composed of pacing_t;think_t:duration;iteration;U:log_prefix
+  thread level param is composed of pacing_t;think_t:duration;iteration;U:log_prefix:rate:limit
+  if INTERVAL (milli seconds) is given, iterations start at a fixed rate in place of the pacing time, see Stats.pace.
   '''
-  lFlag = L_flag
-  cnt = CNT
-  ending = ENDING
-  pacing_time = int(PACING_TIME)/1000.0
+  ctl = {'cnt': CNT, 'lFlag': L_flag, 'ending': ENDING, 'pacing_time': int(PACING_TIME)/1000.0, 'think_t': 0}
+  interval = int(INTERVAL)/1000.0
   time.sleep(DELAY_START)
-  think_t = 0
 
   while True:
     if TaskQueue.empty():
       return
 
     item_x = TaskQueue.get()
-    tc_id = item_x.split(',')[0].lstrip().rstrip()
-    headers = get_headers(tc_id)
-    retry = get_202_retry(tc_id)
-    do_work = get_do_worker(tc_id)
-    param_list = item_x.split(',')[1:]
-
-    method, res, auth, analyser = get_res_n_met(tc_id, param_list) # get respective request method, resource name and auth flag
-    payload = None
-
-    # integrate with dynatrace
-    headers['x-dynatrace-test'] += ';PC={0};TSN={1};VU={2}'.format(res, tc_id, t_name)
-
-    a_p = "N" # addtional parameter to support statisticss, to sort out different cases.
-    if len(param_list) >= 2 and param_list[-2] == '+a':
-      a_param_list = (param_list[-1] + ":::").split(":")
-      #print(a_param_list)
-      # 1st param to overwrite global pacing_time param
-      if a_param_list[0]:
-        ti_dict = dict(enumerate(a_param_list[0].split(";"))) # pacing time and think time override control
-        if ti_dict.get(0, ''): # pacing time
-          pacing_time = int(ti_dict.get(0)) / 1000.0
-        if ti_dict.get(1, ''): # think time
-          think_t = int(ti_dict.get(1)) / 1000.0
-      # 2nd additional param consists of 3 control elements, 1) override excution duration; 2) override number of execution count;
-      # override globle -U flag.
-      if a_param_list[1]:
-        ctl_dict = dict(enumerate(a_param_list[1].split(";")))
-        #print(ctl_dict)
-        if ctl_dict.get(2, ''): # token overwritten control
-          if ctl_dict.get(2, '') == 'U':
-            CONTEXT['u_flag'] = True
-          else:
-            CONTEXT['u_flag'] = False
-          #print("U override")
-        if ctl_dict.get(0, ''): # execution duration overwritten control
-          ending = time.time() + float(int(ctl_dict.get(0)) * 60) # set estimated ending time.
-          lFlag = True # duration dominant
-        if ctl_dict.get(1, '') and not ctl_dict.get(0, '') : # number of execution count overwritten control
-          cnt = int(ctl_dict.get(1))
-          lFlag = False # count dominant
-
-      param_list = param_list[:-2]
-      a_p = a_param_list[2] if len(a_param_list[2]) > 0 else "N"
-
-    req = Comm_req(log, get_end_point(tc_id), proxies=PROXIES)
-    if auth == 'Y':
-      if CONTEXT['u_flag'] or isToken(param_list[1]):
-        u_token = param_list[1]
-      else:
-        u_token = X00_login(tc_id, CONTEXT, param_list, verbose=0)
-        param_list[1] = u_token
-      headers['authorization'] = u_token
-      if u_token is None:
-        TaskQueue.task_done()
-        continue
-
-    if method: # if method is None, it means pseudo TC
-      payload = get_payload(tc_id, param_list, query_str_fl(tc_id)) # get respective TC payload
-      url = get_end_point(tc_id) + res
-
-    param_list.append(1) # param used as a flip and flap switch to some TCs.
-    if lFlag: # control by duration
+    prepared = prepare(item_x, log, t_name, ctl)
+    if prepared is None: # login failed
+      TaskQueue.task_done()
+      continue
+    work, _ = prepared
+    if ctl['lFlag']: # control by duration
       while True:
         current = time.time()
-        if current < ending:
-          time.sleep(float(pacing_time))
-          param_list[-1] ^= 1
-          do_work(req, res, headers, payload, method, log, tc_id, param_list, retry, a_p, think_t)
+        if current < ctl['ending']:
+          time.sleep(Stats.pace(interval) if interval else float(ctl['pacing_time']))
+          work()
         else:
           break
     else:
-      for i in range(cnt):
-        time.sleep(float(pacing_time))
-        param_list[-1] ^= 1
-        do_work(req, res, headers, payload, method, log, tc_id, param_list, retry, a_p, think_t)
+      for i in range(ctl['cnt']):
+        time.sleep(Stats.pace(interval) if interval else float(ctl['pacing_time']))
+        work()
     TaskQueue.task_done()
 
+def open_model(lines, spec, THREADS, first, CNT, L_flag, ENDING, log):
+  '''
+  open workload model of -T option: each of TC lines is sent at arrival rate spec, or its own rate of +a params, by THREADS
+  sender threads named from T<first + 1>, for the execution duration or count of the line.
+  '''
+  model = OpenModel(THREADS)
+  for k, line in enumerate(lines):
+    ctl = {'cnt': CNT, 'lFlag': L_flag, 'ending': ENDING, 'pacing_time': 0, 'think_t': 0}
+    prepared = prepare(line, log, 'L{0:02d}'.format(k + 1), ctl, concurrent=True)
+    if prepared is None: # login failed
+      continue
+    work, rate = prepared
+    rate = rate or spec
+    try:
+      rate_fn(rate)
+    except ValueError as err:
+      print('{0}: {1}'.format(line, err))
+      continue
+    if ctl['lFlag']:
+      model.add(rate, work, end_ns=clock_ns() + int((ctl['ending'] - time.time()) * 1e9))
+    else:
+      model.add(rate, work, count=ctl['cnt'])
+  model.run(first)
+
+def multi_threads(lines, THREADS, first, appendix, b_flag, RAMPUP, M_CNT, L_flag, ending, DELAY_START, pacing_time, DT_ID, rate_spec=None, interval=0,
+                  pools=(None, None)):
+  '''
+  run TC lines by THREADS worker threads, named from T<first + 1>, logging statistics into myApp_M<THREADS>.<appendix>.
+  it runs in main process, or in each of the processes of -P option with its shard of lines and threads.
+  lines are sent at arrival rate rate_spec (open model) by THREADS sender threads if rate_spec is given, otherwise a thread
+  starts its iterations every interval milli seconds if interval is given. pools are pool_connections and pool_maxsize of
+  the keep-alive connection pools, pool_maxsize defaults to THREADS.
+  '''
+  t_log_name = myApp + '_M' + str(THREADS) + '.' + appendix
+  t_log = thread_logger(myApp, THREADS, appendix) # get thread logger
+  CONTEXT['t_log'] = t_log
+  if b_flag:
+    Stats.sink = BinSink(t_log_name + '.bin')
+    print('Statistics logged in binary records: {0}'.format(t_log_name + '.bin'))
+  Stats.start_writer() # stats written by background thread, off the request path.
+  Pools.configure(pool_connections=pools[0], pool_maxsize=pools[1] or THREADS) # by default a keep-alive connection per thread to each end point
+  Stats.lags = bool(rate_spec or interval)
+  if rate_spec:
+    open_model(lines, rate_spec, THREADS, first, M_CNT, L_flag, ending, t_log)
+  else:
+    while True:
+      # stuff work items on the queue (in this case, just a tuple of TC id and param list).
+      for line in lines:
+        # put TC id, and context parameters into a queue
+        TaskQueue.put(line)
+
+      # Create the queue and thread pool.
+      if RAMPUP:
+        BAT = int(RAMPUP.split(":")[0])
+        #t_w = int(RAMPUP.split(":")[1]) * 60
+        t_w = int(RAMPUP.split(":")[1])
+      else:
+        BAT = THREADS
+        t_w = 0
+      for i in range(THREADS):
+        t_name = 'T{0:02d}'.format(first+i+1)
+        th = threading.Thread(target=worker, name=t_name, args=(M_CNT, L_flag, ending, DELAY_START, pacing_time, t_log, DT_ID, t_name, interval))
+        th.daemon = True  # thread dies when main thread (only non-daemon thread) exits.
+        th.start()
+        if t_w != 0 and (i + 1) % BAT == 0 and i < THREADS - 1:
+          time.sleep(t_w)
+
+      TaskQueue.join()       # block until all tasks are done
+
+      # check whether current time exceeds ending time, if not entering into another round of for loop.
+      if L_flag == True:
+        current = time.time()
+        if current > ending:
+          break
+      else:
+        break
+  Stats.stop_writer()
+  if Stats.sink:
+    Stats.sink.close()
+
 # Define a main() function
 def main():
   ###############################
@@ -4181,12 +4335,17 @@ def main():
   L_flag = False
   M_flag = False
   R_flag = False
+  b_flag = False
   verbose = 0
   ENV = 'UAT'
   DT_ID = None
   #keys = 'id:code:name:status:type:start'
   pacing_time = 0
   THREADS = 0
+  PROCS = 1
+  rate_spec = None # target arrival rate of open model, set by -T option
+  interval = 0 # milli seconds between intended starts of a thread's iterations, set by -x option
+  pools = (None, None) # pool_connections and pool_maxsize of keep-alive connection pools, set by -C option
   RAMPUP = None
   M_CNT = 1
   DELAY_START = 1 # postponning some sec before reading item from a queue, give producer some time to prepare the queue
@@ -4198,7 +4357,7 @@ def main():
 
   # parse command line options
   try:
-    opts, args = getopt.getopt(sys.argv[1:], "A:e:k:f:s:w:B:L:p:M:c:D:V:RShdvtU")
+    opts, args = getopt.getopt(sys.argv[1:], "A:e:k:f:s:w:x:r:C:B:L:p:P:M:T:c:D:V:bHRShdvtU")
   except getopt.GetoptError as err:
     # print help information and exit:
     logger.error(err)
@@ -4218,10 +4377,28 @@ def main():
       CONTEXT['passwd'] = a
     elif o == "-w":
       pacing_time = a
+    elif o == "-x":
+      interval = a
+    elif o == "-r":
+      try:
+        Limits.configure(a)
+      except ValueError as err:
+        print('Invalid rate limits {0}: {1}'.format(a, err))
+        sys.exit(2)
+    elif o == "-C":
+      try:
+        pools = tuple(int(n) if n else None for n in (a + ':').split(':')[:2])
+      except ValueError:
+        print('Invalid pools {0}, expected pool_connections[:pool_maxsize], e.g. 10:50'.format(a))
+        sys.exit(2)
     elif o == "-c":
       M_CNT = int(a)
     elif o == "-R":
       R_flag = True
+    elif o == "-b":
+      b_flag = True
+    elif o == "-H":
+      Stats.phases = True
     elif o == "-t":
       t_flag = True
     elif o == "-U":
@@ -4231,6 +4408,15 @@ def main():
     elif o == "-M":
       M_flag = True
       THREADS = int(a)
+    elif o == "-P":
+      PROCS = int(a)
+    elif o == "-T":
+      try:
+        rate_fn(a)
+      except ValueError as err:
+        print(err)
+        sys.exit(2)
+      rate_spec = a
     elif o == "-d":
       CONTEXT['debug'] = True
     elif o == "-v":
@@ -4307,6 +4493,10 @@ def main():
             param_list = line.split(',')[1:] if len(line.split(',')) > 1 else []
             if '+a' in param_list:
               index = param_list.index('+a')
+              # 1st additional param, pacing time slept before this line, e.g. the gaps of a tc_file generated by har_ana.py -t
+              pacing = (param_list[index + 1:] + [''])[0].split(":")[0].split(";")[0]
+              if pacing:
+                time.sleep(int(pacing) / 1000.0)
               param_list = param_list[:index]
 
             get_func(tc_id, CONTEXT, param_list, verbose)
@@ -4329,43 +4519,30 @@ def main():
       ts = m_start.strftime('%Y%m%d%H%M%S')
       t_log_name = myApp + '_M' + str(THREADS) + '.' + ts
       print('Program started with multi-threading, checking log file for prograss: {0}'.format(t_log_name))
-      t_log = thread_logger(myApp, THREADS, ts) # get thread logger
-      CONTEXT['t_log'] = t_log
-      while True:
-        # stuff work items on the queue (in this case, just a tuple of TC id and param list).
-        with open(fn, 'r') as fh:
-          for line in fh:
-            line = line.rstrip('\n').lstrip()
-            if line.startswith('#') or not line:
-              continue
-            # put TC id, and context parameters into a queue
-            TaskQueue.put(line)
-
-        # Create the queue and thread pool.
-        if RAMPUP:
-          BAT = int(RAMPUP.split(":")[0])
-          #t_w = int(RAMPUP.split(":")[1]) * 60
-          t_w = int(RAMPUP.split(":")[1])
-        else:
-          BAT = THREADS
-          t_w = 0
-        for i in range(THREADS):
-          t_name = 'T{0:02d}'.format(i+1)
-          th = threading.Thread(target=worker, name=t_name, args=(M_CNT, L_flag, ending, DELAY_START, pacing_time, t_log, DT_ID, t_name))
-          th.daemon = True  # thread dies when main thread (only non-daemon thread) exits.
-          th.start()
-          if t_w != 0 and (i + 1) % BAT == 0 and i < THREADS - 1:
-            time.sleep(t_w)
-
-        TaskQueue.join()       # block until all tasks are done
-
-        # check whether current time exceeds ending time, if not entering into another round of for loop.
-        if L_flag == True:
-          current = time.time()
-          if current > ending:
-            break
-        else:
-          break
+      # TC lines of tc_file, put into the queue at every round.
+      with open(fn, 'r') as fh:
+        lines = [line.rstrip('\n').lstrip() for line in fh]
+      lines = [line for line in lines if line and not line.startswith('#')]
+      PROCS = max(min(PROCS, THREADS, len(lines)), 1)
+      if PROCS == 1:
+        multi_threads(lines, THREADS, 0, ts, b_flag, RAMPUP, M_CNT, L_flag, ending, DELAY_START, pacing_time, DT_ID, rate_spec, interval, pools)
+      else:
+        # shard TC lines and threads across processes, each runs its own threads and stats log, merged when all are done.
+        Limits.divide(PROCS) # each process sends its share of the rate limits
+        procs = []
+        first = 0
+        for k in range(PROCS):
+          threads = THREADS // PROCS + (1 if k < THREADS % PROCS else 0)
+          appendix = ts + '.P{0}'.format(k + 1)
+          proc = multiprocessing.Process(target=multi_threads, name='P{0}'.format(k + 1), args=(lines[k::PROCS], threads, first, appendix,
+                                         b_flag, RAMPUP, M_CNT, L_flag, ending, DELAY_START, pacing_time, DT_ID, rate_spec, interval, pools))
+          proc.start()
+          procs.append((proc, myApp + '_M' + str(threads) + '.' + appendix + ('.bin' if b_flag else '')))
+          first += threads
+        for proc, _ in procs:
+          proc.join()
+        merge_stats([log for _, log in procs], t_log_name + ('.bin' if b_flag else ''))
+        print('Statistics of {0} processes merged into: {1}'.format(PROCS, t_log_name + ('.bin' if b_flag else '')))
       m_end = datetime.datetime.now()
       logger.info(' - Elapsed time: {0:.3f}'.format((m_end-m_start).total_seconds()))
       print('Elapsed time: {0:.3f} sec.'.format((m_end-m_start).total_seconds()))
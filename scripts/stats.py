@@ -8,35 +8,98 @@
 # HISTORY:
 #       version 1.0     19/12/2018              --- program initial
 #       version 1.1     18/01/2019              --- treated response status_code 304 as pass
+#       version 1.2     18/10/2026              --- memory-mapped binary statistics log produced by new_comm_req.BinSink.
+#       version 1.3     18/10/2026              --- micro second resolution of response time, optional TTFB and BODY columns.
+#       version 1.4     18/10/2026              --- vectorised pass/fail and TPS, groupby aggregation in place of pivot table.
+#       version 1.5     18/10/2026              --- introduced -c option, streaming statistics in chunks with bounded memory.
+#       version 1.6     18/10/2026              --- one generic engine for all scenarios, several scenarios reported from one parse.
+#       version 1.7     18/10/2026              --- scenario 105, windowed timeline of TPS, error rate and percentiles with latency jumps.
+#       version 1.8     18/10/2026              --- scenario 106, in-flight concurrency and active threads curve against -M and -B of driver.
+#       version 1.9     18/10/2026              --- cache of parsed text log (in_file.npz) keyed by log's path, size and mtime, -N option.
+#       version 2.0     18/10/2026              --- dedicated parser of log's time of day, anchored to run date with midnight rollover.
+#       version 2.1     18/10/2026              --- scenario 107, comparison of candidate and baseline runs with regression exit code.
+#       version 2.2     18/10/2026              --- several percentiles in one run, exact or approximate (-a option) percentile engine.
+#       version 2.3     18/10/2026              --- -F option, following the log of a running test with live per TC statistics.
+#       version 2.4     18/10/2026              --- LAG column of open model logs, summary of scheduling lag.
+#       version 2.5     18/10/2026              --- percentiles corrected for coordinated omission next to raw ones, logs with LAG.
 #
 
 import sys
 import os
+import re
+import math
+import io
 from datetime import datetime
 import getopt
 import csv
+import json
+import time
 import numpy as np
 import pandas as pd
 
 # global variables
-version = 'v1.1'
+version = 'v2.5'
+
+# binary statistics log layouts by magic, must be in line with new_comm_req.BinSink
+BIN_FIELDS = [("S_TIME", "<i8"), ("E_TIME", "<i8"), ("DUR", "<f8"), ("BANDWIDTH", "<i8"), ("STA_CODE", "<i4"),
+              ("THREAD", "<i4"), ("API", "<i4"), ("AP", "<i4"), ("URL", "<i4"), ("PARAM", "<i4")]
+BIN_DTYPES = {
+  'STATSB01': np.dtype(BIN_FIELDS),
+  'STATSB02': np.dtype(BIN_FIELDS + [("TTFB", "<f8"), ("BODY", "<f8")]),
+  'STATSB03': np.dtype(BIN_FIELDS + [("TTFB", "<f8"), ("BODY", "<f8"), ("LAG", "<f8")]),
+}
+BIN_MAGIC_LEN = 8
+# TTFB (time to first byte) and BODY (body read time) are present only if driver runs with -H option,
+# LAG (start behind the scheduled start) only if driver runs an open model with -T option.
+OK_SET = (0, 200, 201, 202, 304) # status codes treated as pass by scenario 104
+CHUNK_ROWS = None # rows per chunk of streaming statistics, set by -c option
+APPROX = False # percentiles from histogram (as in streaming) instead of exact, set by -a option
+CACHE = True # keep parsed text log in in_file.npz for later runs, disabled by -N option
+HIST_MIN = 1e-6 # sec., lower bound of percentile histogram
+HIST_GAMMA = 1.01 # ratio of adjacent histogram buckets, i.e. percentile within 0.5% of the exact value in streaming mode, see StreamStats.quantile
+LOG_COLUMNS = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API", "AP", "URL", "PARAM", "TTFB", "BODY", "LAG"]
+# explore (999) reads the earlier log layout, in which URL follows the params.
+EXPLORE_NAMES = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API", "PARAMS", "URL"]
+
+# scenario id: (group by keys, status codes treated as pass, None means <= 202 or 304)
+REPORTS = {
+  '100': (["API"], None),
+  '101': (["THREAD", "API"], None),
+  '102': (["THREAD", "API", "AP"], None),
+  '103': (["URL"], None),
+  '104': (["URL", "AP"], OK_SET),
+  '999': (["API"], None),
+}
 
 
 def usage(arg):
   out_string = '''
 Statistics analysis of performance testing results.
 
-Usage 1: {0} -f in_file -s sce_id params
+Usage 1: {0} [-c rows] [-a] [-N] -f in_file -s sce_id[:sce_id...] params
 Usage 2: {0} -S
+Usage 3: {0} -F secs -f in_file
 
 where
          -S: a flag instructing program to list the supported scenarios.
          -f: specify hereafter input file from where to conduct statistics analysis
     in_file: an input file name, usually it is performance testing log file name.
-         -s: a flag instructing program to execute s scenario given by hereafter sce_id.
+         -s: a flag instructing program to execute s scenario given by hereafter sce_id, several scenarios delimited by ":" e.g. 100:101:103
+             are reported from one parse of in_file.
      params: list of parameters in the context of scenario, run program with -S option to see supported scenarios and respective parameters.
-
-Note:
+         -c: a flag instructing program to stream in_file in chunks of hereafter rows e.g. 1000000, keeping memory bounded for logs larger
+             than RAM. Percentiles are then approximated by a histogram, within 0.5% of the exact value.
+         -a: a flag instructing program to approximate percentiles by a log-scaled histogram (relative error within 0.5%) instead of
+             exact percentiles from a sort of all response times, faster and lighter for huge logs. Implied by -c option.
+         -F: a flag instructing program to follow in_file of a running test, refreshing every hereafter secs e.g. 5 the per TC TPS,
+             error rate and 90 percentile of the requests logged since the previous refresh along with totals so far, Ctrl-C to stop.
+         -N: a flag instructing program neither to load nor to write the cache of parsed text log, see Note [2].
+
+Note: [1] in_file can be either text log or binary log (log_file.bin, along with log_file.bin.str) generated with driver's -b option.
+      [2] a text log parsed in whole is cached as in_file.npz, later runs on the same log load it instead of parsing again,
+          and parse again once the log is changed (size or mtime), e.g. a log still being written. -c option doesn't use the cache.
+      [3] a log of a driver run with -T or -x option carries each request's lag behind its intended start, the reports then add
+          corrected percentiles of response time taken from the intended start (coordinated omission) and a scheduling lag summary.
 
 '''.format(arg)
   print(out_string)
@@ -45,346 +108,815 @@ Note:
 def dump_sce():
   out_string = '''
   TC 100: general performance test statistics, segregating by TC.
-          Params required: 1) percentile e.g. 95 (optional) default to 90; 2) filter out Thread id list, e.g. T01:T03:T07, see Note [1].
+          Params required: 1) percentile e.g. 95, or several delimited by ":" e.g. 50:90:95:99:99.9 (optional) default to 90;
+          2) filter out Thread id list, e.g. T01:T03:T07, see Note [1].
           Note: [1] if filter criteria specified, the transactions meet filter criteria will be excluded from statistics report.
 
   TC 101: general performance test statistics, segregating by threads and TC.
-          Params required: 1) percentile e.g. 95 (optional) default to 90
+          Params required: same as TC 100
 
   TC 102: general performance test statistics, segregating by threads, TC and additional param.
-          Params required: 1) percentile e.g. 95 (optional) default to 90
+          Params required: same as TC 100
 
   TC 103: general performance test statistics, segregating by resource URL.
-          Params required: 1) percentile e.g. 95 (optional) default to 90
-
-  TC 104: general performance test statistics, segregating by resource URL and appitional param.
-          Params required: 1) percentile e.g. 95 (optional) default to 90
+          Params required: same as TC 100
+
+  TC 104: general performance test statistics, segregating by resource URL and appitional param, status codes 0, 200-202 and 304 as pass.
+          Params required: same as TC 100
+
+  TC 105: timeline of TPS, error rate and p50/p90/p99 per time window and TC, flagging latency jumps, e.g. GC pauses or connection pool exhaustion.
+          Params required: 1) window in seconds e.g. 60 (optional) default to 10; 2) jump threshold, a window whose p90 exceeds threshold times
+          the TC's median window p90 is flagged, e.g. 3 (optional) default to 2; 3) filter out Thread id list, e.g. T01:T03:T07.
+          Note: TPS of the first and last windows is understated if the run doesn't start or end on window boundary.
+          e.g. stats.py -f new_cc_driver.log_M100.20201016093000 -s 105 60 3
+
+  TC 106: concurrency curve, i.e. requests in flight and active threads per time window by an event sweep of requests' start and end,
+          against threads of -M and ramp up of -B option of the driver, along with peak and mean requests in flight per TC.
+          Params required: 1) window in seconds e.g. 1 (optional) default to 10; 2) threads of -M option, 0 or absent to take from in_file name
+          (e.g. _M100.) or else threads in log; 3) ramp up of -B option e.g. 5:20 (optional) to compare started threads with the schedule;
+          4) filter out Thread id list, e.g. T01:T03:T07.
+          Note: Busy % is requests in flight out of active threads, a low Busy % with all threads active means threads spend the time
+          in pacing or in the driver itself rather than waiting on server. -c option doesn't apply.
+          e.g. stats.py -f new_cc_driver.log_M100.20201016093000 -s 106 1 0 5:20
+
+  TC 107: comparison of a candidate run with the baseline run (in_file) of the same tc_file, segregating by TC or resource URL.
+          deltas of mean, 90 and 99 percentile, TPS and error rate, along with p-value of Mann-Whitney U test of response time.
+          Params required: 1) candidate log file; 2) regression threshold % of mean, percentiles and TPS e.g. 5 (optional) default to 10;
+          3) regression threshold of error rate in percentage points (optional) default to 1; 4) significance level of the test
+          (optional) default to 0.05; 5) API or URL (optional) default to API.
+          Note: a TC regresses if its mean or a percentile is up by more than threshold % while response time is significantly slower,
+          or TPS is down by more than threshold %, or error rate is up by more than the error threshold. Program exits with code 3
+          if any TC regresses, 0 otherwise, to gate a pipeline. -c option doesn't apply.
+          e.g. stats.py -f new_cc_driver.log_M100.20201016093000 -s 107 new_cc_driver.log_M100.20201017093000 5
+
+  TC 999: same as TC 100, for logs of the earlier layout (params followed by URL).
+
+  Note: several TCs of 100 to 104 can be reported in one run, e.g. -s 100:101:102:103:104, the log is parsed once.
 
 '''
   print(out_string)
 
-def stats_100(param_list, in_file):
-  filter_list = []
-  percentile = 90
-
-  if len(param_list) > 0 and param_list[0].isdigit(): 
-    percentile = int(param_list[0])
-
-  if len(param_list) > 1:
-    filter_list = param_list[1].split(":") 
-
-  #f = lambda x: float(datetime.strptime(x, '%H:%M:%S.%f').strftime("%s.%f"))
-  names = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API"]
-  columns = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API"]
-  df = pd.read_csv(in_file, header=None, names=names, usecols=columns, parse_dates=["S_TIME", "E_TIME"])
-
-  if len(filter_list) > 0:
-    df = df.loc[~df["THREAD"].isin(filter_list)]
-
-  df["STA_CODE"] = df.apply(lambda row: 1 if row["STA_CODE"] <= 202 or row["STA_CODE"] == 304 else 0, axis=1)
-
-  df1 = pd.pivot_table(df, index=["API"], values=["DUR", "S_TIME", "E_TIME", "STA_CODE"],
-                       aggfunc={"DUR":[np.min, np.max, np.mean, np.std, lambda x: np.percentile(x, percentile)],
-                                "STA_CODE": [np.sum, 'count'], "S_TIME": [np.min], "E_TIME": [np.max]})
-
-  df1["TPS"] = df1.apply(lambda row: row[("STA_CODE", "count")] / (row[("E_TIME", "amax")] - row[("S_TIME", "amin")]).total_seconds(), axis=1)
-  df1.drop([("E_TIME", "amax"), ("S_TIME", "amin")], axis=1, inplace=True)
-
-  #print(df1.columns.tolist())
-  #print(df1.head())
-
-  # general summy
-  start_time = df["S_TIME"].min().strftime('%H:%M:%S')
-  end_time = df["E_TIME"].max().strftime('%H:%M:%S')
-  dur = int((df["E_TIME"].max() - df["S_TIME"].min()).total_seconds())
-  throughput = df["BANDWIDTH"].sum()
-  tps = df1["TPS"].sum()
-  threads = len(df["THREAD"].unique())
-
-  # dropping pivot table index, rename the columns and followed by re-ordering the columns
-  df1.reset_index(inplace=True)
-  df1.columns = ["API", "{0} Percentile".format(str(percentile)), "Max.(sec.)",
-                 "Min.(sec.)", "Ave.(sec.)", "Std. Dev.", "Fail", "Pass", "TPS"]
-  df1 = df1.reindex(columns=["API", "Min.(sec.)", "Max.(sec.)", "Ave.(sec.)",
-                             "Std. Dev.", "{0} Percentile".format(str(percentile)), "Pass", "Fail", "TPS"])
-  df1["Fail"] = df1.apply(lambda row: row["Fail"] - row["Pass"], axis=1)
-  df1 = df1.round(3) # round to 3 decimal places.
-
-  print("\n,,Start Time,End Time,Duration in sec.,Throughput (MB),TPS (total),,Multi Threads,Pacing Time (sec.)")
-  print(",,{0},{1},{2},{3},{4:.3f},,{5}\n\n".format(start_time, end_time, dur, throughput/1000000, tps, threads))
-
-  print(df1.to_csv(sep=",", index=False, encoding="utf-8"))
-
-
-def stats_101(param_list, in_file):
-  if len(param_list) > 0: 
-    percentile = int(param_list[0])
+def log_format(in_file):
+  '''
+  returns magic of a binary log (None for text log) and number of fields in the first line of a text log.
+  '''
+  with open(in_file, 'rb') as fh:
+    magic = fh.read(BIN_MAGIC_LEN)
+    fh.seek(0)
+    fields = fh.readline().count(',') + 1
+  return (magic, 0) if magic in BIN_DTYPES else (None, fields)
+
+def bin_records(in_file, dtype):
+  '''
+  memory-map binary records and load the interned strings of in_file.str, a partially written trailing record is ignored.
+  '''
+  n = (os.path.getsize(in_file) - BIN_MAGIC_LEN) // dtype.itemsize
+  rec = np.memmap(in_file, dtype=dtype, mode='r', offset=BIN_MAGIC_LEN, shape=(n,))
+  return rec, bin_strings(in_file)
+
+def bin_strings(in_file):
+  '''
+  table of the strings interned in in_file.str by id, the trailing '' stands for an id not yet written.
+  '''
+  strs = {}
+  if os.path.isfile(in_file + '.str'):
+    with open(in_file + '.str', 'rb') as fh:
+      for line in fh:
+        i, s = json.loads(line)
+        strs[i] = s
+  return np.array([strs.get(i, '') for i in range(max(strs) + 1 if strs else 0)] + [''], dtype=object)
+
+def bin_frame(rec, table):
+  '''
+  DataFrame with LOG_COLUMNS of binary records, string ids resolved by table.
+  '''
+  # epoch ns to naive local time, in line with text log time stamps.
+  local = time.localtime(rec["S_TIME"][0] / 1e9) if len(rec) else time.localtime()
+  offset = -(time.altzone if local.tm_isdst > 0 else time.timezone) * 10**9
+
+  df = pd.DataFrame({"S_TIME": pd.to_datetime(rec["S_TIME"] + offset), "E_TIME": pd.to_datetime(rec["E_TIME"] + offset),
+                     "DUR": np.asarray(rec["DUR"]), "BANDWIDTH": np.asarray(rec["BANDWIDTH"]), "STA_CODE": np.asarray(rec["STA_CODE"])})
+  for col in ["THREAD", "API", "AP", "URL", "PARAM"]:
+    df[col] = table[np.minimum(np.asarray(rec[col]), len(table) - 1)]
+  df["PARAM"] = "--" + df["PARAM"]
+  for col in ["TTFB", "BODY", "LAG"]:
+    df[col] = np.asarray(rec[col]) if col in rec.dtype.names else np.nan
+  return df[LOG_COLUMNS]
+
+def run_anchor(in_file):
+  '''
+  run date (ns of local midnight) of a text log and the initial state of parse_times. the date and start time come from the
+  .YYYYmmddHHMMSS suffix the driver names its log with, or the date of the log's last modification for a log renamed otherwise.
+  '''
+  m = re.search(r'\.(\d{8})(\d{2})(\d{2})(\d{2})', os.path.basename(in_file))
+  if m:
+    date = '{0}-{1}-{2}'.format(m.group(1)[:4], m.group(1)[4:6], m.group(1)[6:])
+    tod = ((int(m.group(2)) * 60 + int(m.group(3))) * 60 + int(m.group(4))) * 1000
   else:
-    percentile = 90
-
-  names = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API"]
-  columns = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API"]
-  df = pd.read_csv(in_file, header=None, names=names, usecols=columns, parse_dates=["S_TIME", "E_TIME"])
-
-  df["STA_CODE"] = df.apply(lambda row: 1 if row["STA_CODE"] <= 202 or row["STA_CODE"] == 304 else 0, axis=1)
-
-  df1 = pd.pivot_table(df,index=["THREAD", "API"], values=["DUR", "S_TIME", "E_TIME", "STA_CODE"],
-                       aggfunc={"DUR":[np.min, np.max, np.mean, np.std, lambda x: np.percentile(x, percentile)],
-                                "STA_CODE": [np.sum, 'count'], "S_TIME": [np.min], "E_TIME": [np.max]})
-  #print(df1.columns.tolist())
-  #print(df1.head())
-
-  df1["TPS"] = df1.apply(lambda row: row[("STA_CODE", "count")] / (row[("E_TIME", "amax")] - row[("S_TIME", "amin")]).total_seconds(), axis=1)
-  df1.drop([("E_TIME", "amax"), ("S_TIME", "amin")], axis=1, inplace=True)
-
-
-  # general summy
-  start_time = df["S_TIME"].min().strftime('%H:%M:%S')
-  end_time = df["E_TIME"].max().strftime('%H:%M:%S')
-  dur = int((df["E_TIME"].max() - df["S_TIME"].min()).total_seconds())
-  throughput = df["BANDWIDTH"].sum()
-  tps = df1["TPS"].sum()
-  threads = len(df["THREAD"].unique())
-
-
-  # dropping pivot table index, rename the columns and followed by reordering the columns
-  df1.reset_index(inplace=True)
-  df1.columns = ["Thread", "API", "{0} Percentile".format(str(percentile)), "Max.(sec.)",
-                 "Min.(sec.)", "Ave.(sec.)", "Std. Dev.", "Fail", "Pass", "TPS"]
-  df1 = df1.reindex(columns=["Thread", "API", "Min.(sec.)", "Max.(sec.)", "Ave.(sec.)",
-                             "Std. Dev.", "{0} Percentile".format(str(percentile)), "Pass", "Fail", "TPS"])
-  df1["Fail"] = df1.apply(lambda row: row["Fail"] - row["Pass"], axis=1)
-  df1 = df1.round(3)
-
-  print("\n,,Start Time,End Time,Duration in sec.,Throughput (MB),TPS (total),,Multi Threads,Pacing Time (sec.)")
-  print(",,{0},{1},{2},{3},{4:.3f},,{5}\n\n".format(start_time, end_time, dur, throughput/1000000, tps, threads))
-
-  print(df1.to_csv(sep=",", index=False, encoding="utf-8"))
-
-def stats_102(param_list, in_file):
-  if len(param_list) > 0: 
-    percentile = int(param_list[0])
+    date = time.strftime('%Y-%m-%d', time.localtime(os.path.getmtime(in_file)))
+    tod = None
+  return np.datetime64(date, 'ns').astype(np.int64), {"tod": tod, "days": 0}
+
+def time_of_day(col):
+  '''
+  ms of the day of HH:MM:SS.mmm strings, computed on the strings' bytes in place of generic date inference. the ms field is
+  taken as an integer, e.g. .7 written by earlier new_comm_req is 7 ms rather than 700 ms. -1 for a malformed string.
+  '''
+  b = col.values.astype('S12').view(np.uint8).reshape(-1, 12)
+  digit = lambda j: b[:, j].astype(np.int64) - 48
+  ok = (b[:, 2] == ord(':')) & (b[:, 5] == ord(':')) & (b[:, 8] == ord('.'))
+  for j in [0, 1, 3, 4, 6, 7, 9]:
+    ok &= (b[:, j] >= ord('0')) & (b[:, j] <= ord('9'))
+  ms = np.zeros(len(b), np.int64)
+  for j in range(9, 12):
+    ms = np.where((b[:, j] >= ord('0')) & (b[:, j] <= ord('9')), ms * 10 + digit(j), ms)
+  tod = (((digit(0) * 10 + digit(1)) * 60 + digit(3) * 10 + digit(4)) * 60 + digit(6) * 10 + digit(7)) * 1000 + ms
+  return np.where(ok, tod, -1)
+
+def parse_times(df, anchor, state):
+  '''
+  S_TIME and E_TIME strings of a text log to datetime64 on the run date. S_TIME going back by more than 12 hours is a midnight
+  rollover, and forward by more than 12 hours a line of the previous day logged after the rollover. state carries the last
+  S_TIME and the day across chunks. E_TIME earlier than S_TIME is a request crossing midnight.
+  '''
+  day = 86400000
+  s = time_of_day(df["S_TIME"])
+  e = time_of_day(df["E_TIME"])
+  valid = s >= 0
+  # previous valid S_TIME of each line
+  first = np.nan if state["tod"] is None else state["tod"]
+  prev = pd.Series(np.concatenate([[first], np.where(valid, s, np.nan)[:-1]])).ffill().values
+  delta = np.where(np.isnan(prev), 0, s - prev)
+  days = state["days"] + np.cumsum((valid & (delta < -day // 2)).astype(np.int64) - (valid & (delta > day // 2)))
+  if valid.any():
+    state["tod"] = s[valid][-1]
+    state["days"] = days[valid][-1]
+  nat = np.iinfo(np.int64).min
+  df["S_TIME"] = np.where(valid, anchor + (days * day + s) * 10**6, nat).view('M8[ns]')
+  df["E_TIME"] = np.where(valid & (e >= 0), anchor + ((days + (e < s)) * day + e) * 10**6, nat).view('M8[ns]')
+  return df
+
+def iter_log(in_file, names, usecols=None, chunksize=None):
+  '''
+  load performance testing log as DataFrames of chunksize rows (one DataFrame of the whole log if chunksize is None),
+  names are the log's leading columns in order, usecols the ones to keep.
+  text log is parsed by read_csv, binary log is detected by its magic and memory-mapped.
+  '''
+  magic, fields = log_format(in_file)
+  wanted = usecols or names
+  if magic is None:
+    # name exactly the columns present in the log, e.g. TTFB and BODY only in a log recorded with phases;
+    # requested columns absent from the log are filled with NaN.
+    present = names[:fields] + LOG_COLUMNS[len(names):fields]
+    times = {"S_TIME": str, "E_TIME": str} # parsed by parse_times
+    if chunksize is None and CACHE:
+      # whole log is parsed in full once and then loaded from cache, up to date as long as the log is unchanged
+      key = cache_key(in_file, present)
+      df = load_cache(in_file, key)
+      if df is None:
+        df = parse_times(pd.read_csv(in_file, header=None, names=present, dtype=times), *run_anchor(in_file))
+        save_cache(in_file, key, df)
+      yield df.reindex(columns=wanted)
+      return
+    reader = pd.read_csv(in_file, header=None, names=present, usecols=[c for c in wanted if c in present],
+                         dtype=times, chunksize=chunksize)
+    anchor, state = run_anchor(in_file)
+    for df in ([reader] if chunksize is None else reader):
+      yield parse_times(df, anchor, state).reindex(columns=wanted)
   else:
-    percentile = 90
-
-  names = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API", "AP", "URL", "PARAM"]
-  columns = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API", "AP"]
-  df = pd.read_csv(in_file, header=None, names=names, usecols=columns, parse_dates=["S_TIME", "E_TIME"])
-
-  df["STA_CODE"] = df.apply(lambda row: 1 if row["STA_CODE"] <= 202 or row["STA_CODE"] == 304 else 0, axis=1)
-
-  df1 = pd.pivot_table(df,index=["THREAD", "API", "AP"], values=["DUR", "S_TIME", "E_TIME", "STA_CODE"],
-                       aggfunc={"DUR":[np.min, np.max, np.mean, np.std, lambda x: np.percentile(x, percentile)],
-                                "STA_CODE": [np.sum, 'count'], "S_TIME": [np.min], "E_TIME": [np.max]})
-  #print(df1.columns.tolist())
-  #print(df1.head())
-
-  # [('E_TIME', 'amax'), ('DUR', '<lambda>'), ('DUR', 'amax'), ('DUR', 'amin'), ('DUR', 'mean'), ('DUR', 'std'), ('STA_CODE', 'count'), ('STA_CODE', 'sum'), ('S_TIME', 'amin')]
-  df1["TPS"] = df1.apply(lambda row: row[("STA_CODE", "count")] / (row[("E_TIME", "amax")] - row[("S_TIME", "amin")]).total_seconds(), axis=1)
-  df1.drop([("E_TIME", "amax"), ("S_TIME", "amin")], axis=1, inplace=True)
-
-
-  # general summy
-  start_time = df["S_TIME"].min().strftime('%H:%M:%S')
-  end_time = df["E_TIME"].max().strftime('%H:%M:%S')
-  dur = int((df["E_TIME"].max() - df["S_TIME"].min()).total_seconds())
-  throughput = df["BANDWIDTH"].sum()
-  tps = df1["TPS"].sum()
-  threads = len(df["THREAD"].unique())
-
-  # dropping pivot table index, rename the columns and followed by reordering the columns
-  df1.reset_index(inplace=True)
-  df1.columns = ["Thread", "API", "AP", "{0} Percentile".format(str(percentile)), "Max.(sec.)",
-                 "Min.(sec.)", "Ave.(sec.)", "Std. Dev.", "Fail", "Pass", "TPS"]
-  df1 = df1.reindex(columns=["Thread", "API", "AP", "Min.(sec.)", "Max.(sec.)", "Ave.(sec.)",
-                             "Std. Dev.", "{0} Percentile".format(str(percentile)), "Pass", "Fail", "TPS"])
-  df1["Fail"] = df1.apply(lambda row: row["Fail"] - row["Pass"], axis=1)
-  df1 = df1.round(3)
-
-  print("\n,,Start Time,End Time,Duration in sec.,Throughput (MB),TPS (total),,Multi Threads,Pacing Time (sec.)")
-  print(",,{0},{1},{2},{3},{4:.3f},,{5}\n\n".format(start_time, end_time, dur, throughput/1000000, tps, threads))
-
-  print(df1.to_csv(sep=",", index=False, encoding="utf-8"))
-
-def stats_103(param_list, in_file):
-  filter_list = []
-  percentile = 90
-
-  if len(param_list) > 0 and param_list[0].isdigit(): 
-    percentile = int(param_list[0])
-
-  if len(param_list) > 1:
-    filter_list = param_list[1].split(":") 
-
-  #f = lambda x: float(datetime.strptime(x, '%H:%M:%S.%f').strftime("%s.%f"))
-  names = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API", "AP", "URL", "PARAM"]
-  columns = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "URL"]
-  df = pd.read_csv(in_file, header=None, names=names, usecols=columns, parse_dates=["S_TIME", "E_TIME"])
-
-  if len(filter_list) > 0:
-    df = df.loc[~df["THREAD"].isin(filter_list)]
-
-  df["STA_CODE"] = df.apply(lambda row: 1 if row["STA_CODE"] <= 202 or row["STA_CODE"] == 304 else 0, axis=1)
-
-  df1 = pd.pivot_table(df, index=["URL"], values=["DUR", "S_TIME", "E_TIME", "STA_CODE"],
-                       aggfunc={"DUR":[np.min, np.max, np.mean, np.std, lambda x: np.percentile(x, percentile)],
-                                "STA_CODE": [np.sum, 'count'], "S_TIME": [np.min], "E_TIME": [np.max]})
-
-  df1["TPS"] = df1.apply(lambda row: row[("STA_CODE", "count")] / (row[("E_TIME", "amax")] - row[("S_TIME", "amin")]).total_seconds(), axis=1)
-  df1.drop([("E_TIME", "amax"), ("S_TIME", "amin")], axis=1, inplace=True)
-
-  #print(df1.columns.tolist())
-  #print(df1.head())
-
-  # general summy
-  start_time = df["S_TIME"].min().strftime('%H:%M:%S')
-  end_time = df["E_TIME"].max().strftime('%H:%M:%S')
-  dur = int((df["E_TIME"].max() - df["S_TIME"].min()).total_seconds())
-  throughput = df["BANDWIDTH"].sum()
-  tps = df1["TPS"].sum()
-  threads = len(df["THREAD"].unique())
-
-  # dropping pivot table index, rename the columns and followed by re-ordering the columns
+    rec, table = bin_records(in_file, BIN_DTYPES[magic])
+    step = chunksize or max(len(rec), 1)
+    for i in range(0, max(len(rec), 1), step):
+      df = bin_frame(rec[i:i + step], table).iloc[:, :len(names)]
+      df.columns = names
+      yield df[wanted]
+
+def cache_key(in_file, names):
+  '''
+  a parsed log is valid as long as the log's path, size and mtime, the column names it's parsed with and program version are unchanged.
+  '''
+  st = os.stat(in_file)
+  return [version, os.path.abspath(in_file), str(st.st_size), repr(st.st_mtime)] + list(names)
+
+def load_cache(in_file, key):
+  '''
+  parsed log from in_file.npz, None if absent or stale. string columns are stored as codes and categories, so no pickle is involved.
+  '''
+  try:
+    with np.load(in_file + '.npz') as npz:
+      if list(npz["KEY"]) != key:
+        return None
+      df = pd.DataFrame()
+      for col in npz["COLUMNS"]:
+        if "CATS_" + col in npz.files:
+          df[col] = pd.Categorical.from_codes(npz[col], npz["CATS_" + col].astype(object)).astype(object)
+        else:
+          df[col] = npz[col]
+      return df
+  except (IOError, OSError, KeyError, ValueError):
+    return None
+
+def save_cache(in_file, key, df):
+  '''
+  write parsed log compressed and columnar to in_file.npz, silently skipped if the log's directory isn't writable.
+  '''
+  arrays = {"KEY": np.array(key, dtype=np.str_), "COLUMNS": np.array(list(df.columns), dtype=np.str_)}
+  for col in df.columns:
+    if df[col].dtype == object:
+      codes, cats = pd.factorize(df[col])
+      arrays[col] = codes.astype(np.int32)
+      arrays["CATS_" + col] = np.array([str(c) for c in cats], dtype=np.str_)
+    else:
+      arrays[col] = df[col].values
+  tmp = in_file + '.npz.tmp'
+  try:
+    with open(tmp, 'wb') as fh:
+      np.savez_compressed(fh, **arrays)
+    os.rename(tmp, in_file + '.npz')
+  except (IOError, OSError):
+    pass
+
+def read_log(in_file, names, usecols=None):
+  '''
+  load the whole performance testing log as one DataFrame, see iter_log.
+  '''
+  return next(iter_log(in_file, names, usecols))
+
+def pass_flag(sta_code, ok_set=None):
+  '''
+  vectorised pass (1) / fail (0) of status codes. pass is <= 202 or 304, or membership of ok_set if given.
+  '''
+  codes = sta_code.values
+  if ok_set:
+    return np.isin(codes, ok_set).astype(int)
+  return ((codes <= 202) | (codes == 304)).astype(int)
+
+def group_quantile(g, values, qs):
+  '''
+  per group quantiles qs (linear interpolation, as np.percentile) of values as columns, by one sort of all values on
+  (group, value) shared by all quantiles, in place of groupby quantile which runs per group in python.
+  '''
+  codes = g.ngroup().values
+  sizes = g.size()
+  order = np.lexsort((values, codes))
+  v = values[order]
+  counts = np.bincount(codes[codes >= 0], minlength=len(sizes))
+  starts = np.concatenate(([0], np.cumsum(counts)[:-1])) + (codes < 0).sum() # rows of no group (NaN key) sort first
+  ret = pd.DataFrame(index=sizes.index)
+  for q in qs:
+    pos = q * (counts - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.ceil(pos).astype(np.int64)
+    ret[q] = v[starts + lo] + (v[starts + hi] - v[starts + lo]) * (pos - lo)
+  return ret
+
+def summarise(df, keys, percentiles, flag="PASS"):
+  '''
+  response time, pass/fail count and TPS segregated by keys, computed on columns by groupby().agg instead of row-wise apply.
+  flag is the column of pass (1) / fail (0).
+  '''
+  g = df.groupby(keys, observed=True)
+  # sorted explicitly, observed groupby of categorical keys comes in order of appearance.
+  agg = g.agg({"DUR": ["min", "max", "mean", "std"], flag: ["sum", "count"], "S_TIME": ["min"], "E_TIME": ["max"]}).sort_index()
+  elapsed = (agg[("E_TIME", "max")] - agg[("S_TIME", "min")]) / np.timedelta64(1, 's')
+
+  df1 = pd.DataFrame(index=agg.index)
+  df1["Min.(sec.)"] = agg[("DUR", "min")]
+  df1["Max.(sec.)"] = agg[("DUR", "max")]
+  df1["Ave.(sec.)"] = agg[("DUR", "mean")]
+  df1["Std. Dev."] = agg[("DUR", "std")]
+  pct = group_quantile(g, df["DUR"].values, [p / 100.0 for p in percentiles])
+  for p in percentiles:
+    df1[percentile_name(p)] = pct[p / 100.0]
+  if "LAG" in df and df["LAG"].notna().any():
+    pct = group_quantile(g, corrected_dur(df).values, [p / 100.0 for p in percentiles])
+    for p in percentiles:
+      df1[percentile_name(p, True)] = pct[p / 100.0]
+  df1["Pass"] = agg[(flag, "sum")]
+  df1["Fail"] = agg[(flag, "count")] - agg[(flag, "sum")]
+  df1["TPS"] = agg[(flag, "count")] / elapsed
   df1.reset_index(inplace=True)
-  df1.columns = ["URL", "{0} Percentile".format(str(percentile)), "Max.(sec.)",
-                 "Min.(sec.)", "Ave.(sec.)", "Std. Dev.", "Fail", "Pass", "TPS"]
-  df1 = df1.reindex(columns=["URL", "Min.(sec.)", "Max.(sec.)", "Ave.(sec.)",
-                             "Std. Dev.", "{0} Percentile".format(str(percentile)), "Pass", "Fail", "TPS"])
-  df1["Fail"] = df1.apply(lambda row: row["Fail"] - row["Pass"], axis=1)
-  df1 = df1.round(3) # round to 3 decimal places.
-
-  print("\n,,Start Time,End Time,Duration in sec.,Throughput (MB),TPS (total),,Multi Threads,Pacing Time (sec.)")
-  print(",,{0},{1},{2},{3},{4:.3f},,{5}\n\n".format(start_time, end_time, dur, throughput/1000000, tps, threads))
-
-  print(df1.to_csv(sep=",", index=False, encoding="utf-8"))
-
-
-def stats_104(param_list, in_file):
+  df1.rename(columns={"THREAD": "Thread"}, inplace=True)
+  return df1
+
+class StreamStats(object):
+  '''
+  running per keys counters (count, pass, sum and sum of squares of DUR, min, max, first start, last end) merged chunk by
+  chunk, percentile comes from a histogram of log-scaled DUR buckets which is mergeable as well. memory is bounded by the
+  number of groups and occupied buckets, not by the log size. LAG of all records is summarised the same way, see lag_summary.
+  '''
+  def __init__(self, keys, flag="PASS"):
+    self.keys = keys
+    self.flag = flag
+    self.counters = None
+    self.hist = None
+    self.hist_c = None # histogram of corrected DUR, see corrected_dur
+    self.s_time = None
+    self.e_time = None
+    self.throughput = 0
+    self.threads = set()
+    self.lag_n = 0
+    self.lag_sum = 0.0
+    self.lag_min = None
+    self.lag_max = None
+    self.lag_hist = None
+
+  def add(self, df):
+    df = df.assign(DUR2=df["DUR"] ** 2, BUCKET=hist_bucket(df["DUR"].values))
+    g = df.groupby(self.keys)
+    c = pd.DataFrame({"COUNT": g["DUR"].count(), "SUM": g["DUR"].sum(), "SUM2": g["DUR2"].sum(), "MIN": g["DUR"].min(),
+                      "MAX": g["DUR"].max(), "PASS": g[self.flag].sum(), "FIRST": g["S_TIME"].min(), "LAST": g["E_TIME"].max()})
+    h = df.groupby(self.keys + ["BUCKET"]).size()
+    if self.counters is None:
+      self.counters, self.hist = c, h
+    else:
+      self.counters = pd.concat([self.counters, c]).groupby(level=self.keys).agg(
+        {"COUNT": "sum", "SUM": "sum", "SUM2": "sum", "MIN": "min", "MAX": "max", "PASS": "sum", "FIRST": "min", "LAST": "max"})[c.columns]
+      self.hist = pd.concat([self.hist, h]).groupby(level=self.keys + ["BUCKET"]).sum()
+    if "LAG" in df and df["LAG"].notna().any():
+      h = df.assign(BUCKET=hist_bucket(corrected_dur(df).values)).groupby(self.keys + ["BUCKET"]).size()
+      self.hist_c = h if self.hist_c is None else pd.concat([self.hist_c, h]).groupby(level=self.keys + ["BUCKET"]).sum()
+      lag = df["LAG"].dropna().values
+      h = pd.Series(hist_bucket(lag)).value_counts()
+      self.lag_hist = h if self.lag_hist is None else self.lag_hist.add(h, fill_value=0)
+      self.lag_n += len(lag)
+      self.lag_sum += lag.sum()
+      self.lag_min = lag.min() if self.lag_min is None else min(self.lag_min, lag.min())
+      self.lag_max = lag.max() if self.lag_max is None else max(self.lag_max, lag.max())
+
+    s_time, e_time = df["S_TIME"].min(), df["E_TIME"].max()
+    self.s_time = s_time if self.s_time is None else min(self.s_time, s_time)
+    self.e_time = e_time if self.e_time is None else max(self.e_time, e_time)
+    self.throughput += df["BANDWIDTH"].sum()
+    self.threads.update(df["THREAD"].unique())
+
+  def quantile(self, qs, corrected=False):
+    '''
+    per keys quantiles qs as columns, interpolated at rank q * (count - 1) between the elements of the ranks below and above,
+    as the exact percentiles (np.percentile). an element is taken as the geometric middle of its bucket clipped to min and
+    max (of DUR, min only if corrected), i.e. within sqrt(HIST_GAMMA) - 1 of its value, so is the interpolation of two.
+    buckets are sorted and accumulated once for all quantiles.
+    '''
+    h = (self.hist_c if corrected else self.hist).rename("N").reset_index().sort_values(self.keys + ["BUCKET"])
+    cum = h.groupby(self.keys)["N"].cumsum()
+    total = h.groupby(self.keys)["N"].transform("sum") - 1
+    lower, upper = self.counters["MIN"], None if corrected else self.counters["MAX"]
+
+    def element(rank):
+      bucket = h[cum > rank].groupby(self.keys)["BUCKET"].first()
+      return pd.Series(bucket_value(bucket.values), index=bucket.index).clip(lower, upper)
+
+    n = h.groupby(self.keys)["N"].sum() - 1
+    ret = pd.DataFrame(index=self.counters.index)
+    for q in qs:
+      below = np.floor(q * total)
+      v = element(below)
+      ret[q] = v + (element(np.minimum(below + 1, total)) - v) * (q * n - np.floor(q * n))
+    return ret
+
+  def lag_summary(self):
+    '''
+    (requests, average, 99 percentile, max) of LAG, None if the log has no LAG. the percentile is taken from the histogram
+    as in quantile.
+    '''
+    if not self.lag_n:
+      return None
+    h = self.lag_hist.sort_index()
+    cum = h.cumsum().values
+
+    def element(rank):
+      return min(max(bucket_value(h.index[np.searchsorted(cum, rank, side="right")]), self.lag_min), self.lag_max)
+
+    rank = 0.99 * (self.lag_n - 1)
+    below = math.floor(rank)
+    p99 = element(below) + (element(min(below + 1, self.lag_n - 1)) - element(below)) * (rank - below)
+    return self.lag_n, self.lag_sum / self.lag_n, p99, self.lag_max
+
+  def result(self, percentiles):
+    c = self.counters
+    n = c["COUNT"]
+    elapsed = (c["LAST"] - c["FIRST"]) / np.timedelta64(1, 's')
+
+    df1 = pd.DataFrame(index=c.index)
+    df1["Min.(sec.)"] = c["MIN"]
+    df1["Max.(sec.)"] = c["MAX"]
+    df1["Ave.(sec.)"] = c["SUM"] / n
+    df1["Std. Dev."] = np.sqrt(np.maximum(c["SUM2"] - c["SUM"] ** 2 / n, 0) / (n - 1)).where(n > 1)
+    pct = self.quantile([p / 100.0 for p in percentiles])
+    for p in percentiles:
+      df1[percentile_name(p)] = pct[p / 100.0]
+    if self.hist_c is not None:
+      pct = self.quantile([p / 100.0 for p in percentiles], True)
+      for p in percentiles:
+        df1[percentile_name(p, True)] = pct[p / 100.0]
+    df1["Pass"] = c["PASS"]
+    df1["Fail"] = n - c["PASS"]
+    df1["TPS"] = n / elapsed
+    df1.reset_index(inplace=True)
+    df1.rename(columns={"THREAD": "Thread"}, inplace=True)
+    return df1
+
+def hist_bucket(dur):
+  '''
+  log-scaled histogram bucket of durations, bucket b holds (HIST_MIN * HIST_GAMMA^(b-1), HIST_MIN * HIST_GAMMA^b].
+  '''
+  return np.ceil(np.log(np.maximum(dur, HIST_MIN) / HIST_MIN) / np.log(HIST_GAMMA)).astype(np.int64)
+
+def bucket_value(bucket):
+  return HIST_MIN * HIST_GAMMA ** (bucket - 0.5)
+
+def percentile_name(p, corrected=False):
+  return "{0}{1:g} Percentile".format("Corrected " if corrected else "", p)
+
+def corrected_dur(df):
+  '''
+  response time from the intended start, i.e. DUR plus LAG of a request delayed behind its schedule (coordinated omission).
+  '''
+  return df["DUR"] + df["LAG"].fillna(0).clip(lower=0)
+
+def pass_column(ok_set):
+  return "PASS" if ok_set is None else "PASS_OK"
+
+def run_reports(sce_ids, param_list, in_file):
+  '''
+  generic engine of all scenarios: in_file is parsed once, into a frame typed with categorical group keys, and every
+  scenario in sce_ids is a regrouping of the same frame. With -c option the log is streamed once instead, each chunk
+  feeding StreamStats of every scenario.
+  '''
+  percentiles = [90]
   filter_list = []
-  percentile = 90
-
-  if len(param_list) > 0 and param_list[0].isdigit(): 
-    percentile = int(param_list[0])
-
+  if len(param_list) > 0 and re.match(r'^\d+(\.\d+)?(:\d+(\.\d+)?)*$', param_list[0]):
+    percentiles = [float(p) for p in param_list[0].split(":")]
   if len(param_list) > 1:
-    filter_list = param_list[1].split(":") 
-
-  #f = lambda x: float(datetime.strptime(x, '%H:%M:%S.%f').strftime("%s.%f"))
-  names = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API", "AP", "URL", "PARAMS"]
-  columns = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "URL", "AP"]
-  df = pd.read_csv(in_file, header=None, names=names, usecols=columns, parse_dates=["S_TIME", "E_TIME"])
-
-  if len(filter_list) > 0:
-    df = df.loc[~df["THREAD"].isin(filter_list)]
+    filter_list = param_list[1].split(":")
 
-  ok_set = (0, 200, 201, 202, 304)
-  #df["STA_CODE"] = df.apply(lambda row: 1 if row["STA_CODE"] <= 202 or row["STA_CODE"] == 304 else 0, axis=1)
-  df["STA_CODE"] = df.apply(lambda row: 1 if row["STA_CODE"] in ok_set else 0, axis=1)
-
-  df1 = pd.pivot_table(df, index=["URL", "AP"], values=["DUR", "S_TIME", "E_TIME", "STA_CODE"],
-                       aggfunc={"DUR":[np.min, np.max, np.mean, np.std, lambda x: np.percentile(x, percentile)],
-                                "STA_CODE": [np.sum, 'count'], "S_TIME": [np.min], "E_TIME": [np.max]})
-
-  #print(df1.columns.tolist())
-  #print(df1.head())
-  
-  df1["TPS"] = df1.apply(lambda row: row[("STA_CODE", "count")] / (row[("E_TIME", "amax")] - row[("S_TIME", "amin")]).total_seconds(), axis=1)
-  df1.drop([("E_TIME", "amax"), ("S_TIME", "amin")], axis=1, inplace=True)
-
-  #print(df1.columns.tolist())
-  #print(df1.head())
+  if '999' in sce_ids and len(sce_ids) > 1:
+    print("Scenario 999 reads the earlier log layout, it can't be combined with other scenarios.")
+    sys.exit(2)
+  names = EXPLORE_NAMES if '999' in sce_ids else LOG_COLUMNS
+  reports = [(sce_id,) + REPORTS[sce_id] for sce_id in sce_ids]
+  keys_all = []
+  for _, keys, _ in reports:
+    keys_all += [k for k in keys if k not in keys_all]
+  ok_sets = set(ok_set for _, _, ok_set in reports)
+  columns = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE"] + [k for k in keys_all if k != "THREAD"]
+  if '999' not in sce_ids:
+    columns.append("LAG")
+
+  streams = [StreamStats(keys, pass_column(ok_set)) for _, keys, ok_set in reports] if CHUNK_ROWS or APPROX else None
+  for df in iter_log(in_file, names, columns, CHUNK_ROWS):
+    if len(filter_list) > 0:
+      df = df.loc[~df["THREAD"].isin(filter_list)]
+    df = df.assign(**dict((pass_column(ok_set), pass_flag(df["STA_CODE"], ok_set)) for ok_set in ok_sets))
+    if streams is None:
+      for k in keys_all:
+        df[k] = df[k].astype("category")
+      results = [summarise(df, keys, percentiles, pass_column(ok_set)) for _, keys, ok_set in reports]
+      overall = (df["S_TIME"].min(), df["E_TIME"].max(), df["BANDWIDTH"].sum(), len(df["THREAD"].unique()))
+      lag = df["LAG"].dropna() if "LAG" in df else []
+      lag = (len(lag), lag.mean(), lag.quantile(0.99), lag.max()) if len(lag) else None
+      break
+    for st in streams:
+      st.add(df)
+  else:
+    results = [st.result(percentiles) for st in streams]
+    overall = (streams[0].s_time, streams[0].e_time, streams[0].throughput, len(streams[0].threads))
+    lag = streams[0].lag_summary()
 
+  s_time, e_time, throughput, threads = overall
   # general summy
-  start_time = df["S_TIME"].min().strftime('%H:%M:%S')
-  end_time = df["E_TIME"].max().strftime('%H:%M:%S')
-  dur = int((df["E_TIME"].max() - df["S_TIME"].min()).total_seconds())
-  throughput = df["BANDWIDTH"].sum()
-  tps = df1["TPS"].sum()
-  threads = len(df["THREAD"].unique())
-
-  # dropping pivot table index, rename the columns and followed by re-ordering the columns
-  df1.reset_index(inplace=True)
-  df1.columns = ["URL", "AP", "{0} Percentile".format(str(percentile)), "Max.(sec.)",
-                 "Min.(sec.)", "Ave.(sec.)", "Std. Dev.", "Fail", "Pass", "TPS"]
-  df1 = df1.reindex(columns=["URL", "AP", "Min.(sec.)", "Max.(sec.)", "Ave.(sec.)",
-                             "Std. Dev.", "{0} Percentile".format(str(percentile)), "Pass", "Fail", "TPS"])
-  df1["Fail"] = df1.apply(lambda row: row["Fail"] - row["Pass"], axis=1)
-  df1 = df1.round(3) # round to 3 decimal places.
-
-  print("\n,,Start Time,End Time,Duration in sec.,Throughput (MB),TPS (total),,Multi Threads,Pacing Time (sec.)")
-  print(",,{0},{1},{2},{3},{4:.3f},,{5}\n\n".format(start_time, end_time, dur, throughput/1000000, tps, threads))
-
+  start_time = s_time.strftime('%H:%M:%S')
+  end_time = e_time.strftime('%H:%M:%S')
+  dur = int((e_time - s_time).total_seconds())
+
+  for (sce_id, _, _), df1 in zip(reports, results):
+    tps = df1["TPS"].sum()
+    df1 = df1.round(6).round({"TPS": 3}) # response time in micro seconds, TPS to 3 decimal places.
+
+    if len(reports) > 1:
+      print("\nScenario {0}".format(sce_id))
+    print("\n,,Start Time,End Time,Duration in sec.,Throughput (MB),TPS (total),,Multi Threads,Pacing Time (sec.)")
+    print(",,{0},{1},{2},{3},{4:.3f},,{5}\n\n".format(start_time, end_time, dur, throughput/1000000, tps, threads))
+
+    print(df1.to_csv(sep=",", index=False, encoding="utf-8"))
+
+  # open model (-T option of driver): a lag growing beyond the pacing of the target rate means the driver fell short of the rate.
+  if lag:
+    print("\n,,Scheduling Lag (sec.),Requests,Average,99 Percentile,Max")
+    print(",,,{0},{1:.6f},{2:.6f},{3:.6f}\n".format(*lag))
+
+
+def tail_log(in_file):
+  '''
+  generator of DataFrames with LOG_COLUMNS of the records appended to in_file (text or binary log) since the previous one,
+  a partially written trailing line or record is left to the next.
+  '''
+  offset = 0
+  anchor, state = run_anchor(in_file)
+  while True:
+    magic, fields = log_format(in_file)
+    with open(in_file, 'rb') as fh:
+      fh.seek(offset)
+      data = fh.read()
+    if magic is not None:
+      dtype = BIN_DTYPES[magic]
+      data = data[BIN_MAGIC_LEN if offset == 0 else 0:]
+      n = len(data) // dtype.itemsize
+      offset += (BIN_MAGIC_LEN if offset == 0 else 0) + n * dtype.itemsize
+      df = bin_frame(np.frombuffer(data[:n * dtype.itemsize], dtype=dtype), bin_strings(in_file))
+    else:
+      data = data[:data.rfind(b'\n') + 1]
+      offset += len(data)
+      if data:
+        df = pd.read_csv(io.BytesIO(data), header=None, names=LOG_COLUMNS[:fields], dtype={"S_TIME": str, "E_TIME": str})
+        df = parse_times(df, anchor, state)
+      else:
+        df = pd.DataFrame(columns=LOG_COLUMNS)
+    yield df.reindex(columns=LOG_COLUMNS)
+
+def follow(in_file, interval):
+  '''
+  follow in_file while the driver is writing it, every interval seconds refresh the terminal with per TC TPS, error rate and
+  p90 of the requests logged since the previous refresh, along with the run's totals from rolling counters and histogram.
+  '''
+  total = StreamStats(["API"])
+  lines = 0
+  start = last = time.time()
+  reader = tail_log(in_file)
+  try:
+    while True:
+      time.sleep(interval)
+      df = next(reader)
+      now = time.time()
+      if len(df) > 0:
+        df["PASS"] = pass_flag(df["STA_CODE"])
+        total.add(df)
+        lines += len(df)
+      if total.counters is not None:
+        out = total.result([90]).set_index("API")
+        win = pd.DataFrame(index=out.index)
+        if len(df) > 0:
+          g = df.groupby("API")
+          win["COUNT"] = g["DUR"].count()
+          win["FAIL"] = win["COUNT"] - g["PASS"].sum()
+          win["P90"] = group_quantile(g, df["DUR"].values, [0.9])[0.9]
+        win = win.reindex(columns=["COUNT", "FAIL", "P90"]).fillna({"COUNT": 0, "FAIL": 0})
+
+        df1 = pd.DataFrame(index=out.index)
+        df1["TPS"] = win["COUNT"] / (now - last)
+        df1["Error %"] = win["FAIL"] * 100.0 / win["COUNT"]
+        df1["90 Percentile"] = win["P90"]
+        df1["Count (total)"] = out["Pass"] + out["Fail"]
+        df1["TPS (total)"] = out["TPS"]
+        df1["Error % (total)"] = out["Fail"] * 100.0 / df1["Count (total)"]
+        df1["90 Percentile (total)"] = out["90 Percentile"]
+        print("\033[2J\033[H{0}, {1} lines, refreshed every {2}s, {3:.0f}s elapsed, Ctrl-C to stop\n".format(in_file, lines, interval, now - start))
+        print(df1.round(6).round({"TPS": 3, "Error %": 2, "TPS (total)": 3, "Error % (total)": 2}).to_string(na_rep="-"))
+      else:
+        print("waiting for {0} ...".format(in_file))
+      sys.stdout.flush()
+      last = now
+  except KeyboardInterrupt:
+    print("")
+
+
+def stats_105(param_list, in_file):
+  '''
+  timeline of TPS, error rate and p50/p90/p99 per window and API, windows whose p90 jumps past threshold times the API's
+  median window p90 are flagged. windows are aligned to the epoch, so chunks of -c option fall into the same windows.
+  '''
+  window = int(param_list[0]) if len(param_list) > 0 and param_list[0].isdigit() else 10
+  threshold = float(param_list[1]) if len(param_list) > 1 and param_list[1] else 2.0
+  filter_list = param_list[2].split(":") if len(param_list) > 2 else []
+  quantiles = [0.5, 0.9, 0.99]
+  keys = ["WINDOW", "API"]
+
+  st = StreamStats(keys) if CHUNK_ROWS or APPROX else None
+  for df in iter_log(in_file, LOG_COLUMNS[:10], ["THREAD", "S_TIME", "DUR", "STA_CODE", "API", "BANDWIDTH", "E_TIME"], CHUNK_ROWS):
+    if len(filter_list) > 0:
+      df = df.loc[~df["THREAD"].isin(filter_list)]
+    df = df.assign(PASS=pass_flag(df["STA_CODE"]), WINDOW=df["S_TIME"].values.astype(np.int64) // (window * 10**9))
+    if st is None:
+      g = df.groupby(keys)
+      tl = pd.DataFrame({"COUNT": g["DUR"].count(), "PASS": g["PASS"].sum()}).join(group_quantile(g, df["DUR"].values, quantiles))
+      break
+    st.add(df)
+  else:
+    tl = st.counters[["COUNT", "PASS"]].join(st.quantile(quantiles))
+
+  tl = tl.sort_index().reset_index()
+  baseline = tl.groupby("API")[0.9].transform("median")
+  jump = tl[0.9] > threshold * baseline
+
+  df1 = pd.DataFrame({"Window": pd.to_datetime(tl["WINDOW"] * window, unit="s").dt.strftime('%H:%M:%S'), "API": tl["API"]}, columns=["Window", "API"])
+  df1["Count"] = tl["COUNT"]
+  df1["TPS"] = tl["COUNT"] / float(window)
+  df1["Error %"] = (tl["COUNT"] - tl["PASS"]) * 100.0 / tl["COUNT"]
+  for q in quantiles:
+    df1["P{0:g} (sec.)".format(q * 100)] = tl[q]
+  df1["Jump"] = np.where(jump, "Y", "")
+  df1 = df1.round(6).round({"TPS": 3, "Error %": 2})
+
+  print("\n,,Window (sec.),Jump threshold (x median p90),Windows,Jumps")
+  print(",,{0},{1:g},{2},{3}\n\n".format(window, threshold, tl["WINDOW"].nunique(), int(jump.sum())))
   print(df1.to_csv(sep=",", index=False, encoding="utf-8"))
-
-
-def stats_explore(param_list, in_file):
-  filter_list = []
-  percentile = 90
-
-  if len(param_list) > 0 and param_list[0].isdigit(): 
-    percentile = int(param_list[0])
-
-  if len(param_list) > 1:
-    filter_list = param_list[1].split(":") 
-
-  names = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API", "PARAMS", "URL"]
-  df = pd.read_csv(in_file, header=None, names=names, parse_dates=["S_TIME", "E_TIME"])
-
+  if jump.any():
+    print("Latency jumps:")
+    print(df1[jump.values].to_csv(sep=",", index=False, encoding="utf-8"))
+
+
+def sweep(start, end, key=None):
+  '''
+  event sweep of requests' start/end (ns), returns event times, keys and the in-flight count after each event, O(n log n) by one sort.
+  an end sorts before a start of the same instant; with key, events of each key are contiguous and its count starts from 0.
+  '''
+  t = np.concatenate([start, end])
+  delta = np.concatenate([np.ones(len(start), np.int64), -np.ones(len(end), np.int64)])
+  k = np.zeros(len(t), np.int64) if key is None else np.concatenate([key, key])
+  order = np.lexsort((delta, t, k))
+  return t[order], k[order], np.cumsum(delta[order])
+
+def curve(t, c, bounds):
+  '''
+  time weighted mean and max of step function c (level after event at t) in windows between consecutive bounds (ns).
+  '''
+  area = np.concatenate([[0.0], np.cumsum(np.diff(t) * c[:-1].astype(float))])
+  idx = np.searchsorted(t, bounds, 'right') - 1
+  i = np.maximum(idx, 0)
+  level = np.where(idx >= 0, c[i], 0)
+  at = np.where(idx >= 0, area[i] + level * (bounds - t[i]).astype(float), 0.0)
+  mean = np.diff(at) / np.diff(bounds)
+  peak = level[:-1].copy() # level carried into window
+  win = np.searchsorted(bounds, t, 'right') - 1
+  inside = (win >= 0) & (win < len(bounds) - 1)
+  np.maximum.at(peak, win[inside], c[inside])
+  return mean, peak
+
+def stats_106(param_list, in_file):
+  '''
+  in-flight concurrency and active threads curve by event sweep of requests' start/end, against configured threads (-M) and
+  ramp up (-B) of the driver. a thread is active from its first request's start to its last request's end.
+  '''
+  step = int(param_list[0]) if len(param_list) > 0 and param_list[0].isdigit() and int(param_list[0]) > 0 else 10
+  threads = int(param_list[1]) if len(param_list) > 1 and param_list[1].isdigit() else 0
+  rampup = param_list[2] if len(param_list) > 2 and ":" in param_list[2] else None
+  filter_list = param_list[3].split(":") if len(param_list) > 3 else []
+
+  df = read_log(in_file, LOG_COLUMNS[:10], ["THREAD", "S_TIME", "E_TIME", "API"])
   if len(filter_list) > 0:
     df = df.loc[~df["THREAD"].isin(filter_list)]
-
-  df["STA_CODE"] = df.apply(lambda row: 1 if row["STA_CODE"] <= 202 or row["STA_CODE"] == 304 else 0, axis=1)
-
-  df1 = pd.pivot_table(df, index=["API"], values=["DUR", "S_TIME", "E_TIME", "STA_CODE"],
-                       aggfunc={"DUR":[np.min, np.max, np.mean, np.std, lambda x: np.percentile(x, percentile)],
-                                "STA_CODE": [np.sum, 'count'], "S_TIME": [np.min], "E_TIME": [np.max]})
-
-  df1["TPS"] = df1.apply(lambda row: row[("STA_CODE", "count")] / (row[("E_TIME", "amax")] - row[("S_TIME", "amin")]).total_seconds(), axis=1)
-  #df1["TPS"] = df1[("STA_CODE", "count")] / pd.to_numeric(df1[("E_TIME", "amax")] - df1[("S_TIME", "amin")])*1000000000
-  df1.drop([("E_TIME", "amax"), ("S_TIME", "amin")], axis=1, inplace=True)
-
-  #print(df1.columns.tolist())
-  #print(df1.head())
-
-  # high level summy
-  start_time = df["S_TIME"].min().strftime('%H:%M:%S')
-  end_time = df["E_TIME"].max().strftime('%H:%M:%S')
-  dur = int((df["E_TIME"].max() - df["S_TIME"].min()).total_seconds())
-  throughput = df["BANDWIDTH"].sum()
-  tps = df1["TPS"].sum()
-  threads = len(df["THREAD"].unique())
-
-  #print('\nStart Time: {0}'.format(start_time))
-  #print('End Time: {0}'.format(end_time))
-  #print('Duration: {0} in sec.'.format(dur))
-  #print('Throughput: {0}(MB)'.format(throughput/1000000))
-  #print('Multi Threads: {0}'.format(threads))
-  #print("TPS (total): {0:.3f}\n".format(tps))
-
-  # dropping pivot table index, rename the columns and followed by reordering the columns
-  df1.reset_index(inplace=True)
-  df1.columns = ["API", "{0} Percentile".format(str(percentile)), "Max.(sec.)",
-                 "Min.(sec.)", "Ave.(sec.)", "Std. Dev.", "Fail", "Pass", "TPS"]
-  df1 = df1.reindex(columns=["API", "Min.(sec.)", "Max.(sec.)", "Ave.(sec.)",
-                             "Std. Dev.", "{0} Percentile".format(str(percentile)), "Pass", "Fail", "TPS"])
-  df1["Fail"] = df1.apply(lambda row: row["Fail"] - row["Pass"], axis=1)
+  start = df["S_TIME"].values.astype(np.int64)
+  end = df["E_TIME"].values.astype(np.int64)
+  end = np.maximum(end, start) # E_TIME of a request crossing midnight
+  if not threads:
+    m = re.search(r'_M(\d+)\.', os.path.basename(in_file))
+    threads = int(m.group(1)) if m else df["THREAD"].nunique()
+  ns = 10**9
+  t0 = start.min()
+  bounds = np.arange(t0 // (step * ns) * step * ns, end.max() + step * ns, step * ns)
+
+  t, k, c = sweep(start, end)
+  inflight_mean, inflight_max = curve(t, c, bounds)
+  th = df.assign(S_NS=start, E_NS=end).groupby("THREAD").agg({"S_NS": "min", "E_NS": "max"})
+  t, k, c = sweep(th["S_NS"].values, th["E_NS"].values)
+  active_mean, active_max = curve(t, c, bounds)
+
+  df1 = pd.DataFrame({"Window": pd.to_datetime(bounds[:-1] // ns, unit="s").strftime('%H:%M:%S')}, columns=["Window"])
+  df1["Active threads"] = active_max
+  if rampup:
+    bat, t_w = [int(i) for i in rampup.split(":")]
+    df1["Expected threads"] = np.minimum(threads, bat * ((bounds[1:] - 1 - t0) // (max(t_w, 1) * ns) + 1))
+  df1["In-flight max"] = inflight_max
+  df1["In-flight mean"] = inflight_mean
+  df1["Busy %"] = np.where(active_max > 0, inflight_mean * 100.0 / np.maximum(active_max, 1), 0.0)
   df1 = df1.round(3)
 
-  print("\n,,Start Time,End Time,Duration in sec.,Throughput (bytes),TPS (total),,Multi Threads,Pacing Time (sec.)")
-  print(",,{0},{1},{2},{3},{4:.3f},,{5}\n\n".format(start_time, end_time, dur, throughput/1000000, tps, threads))
-
+  # per TC peak and mean over the run
+  codes, apis = pd.factorize(df["API"], sort=True)
+  t, k, c = sweep(start, end, codes)
+  ev = pd.DataFrame({"API": k, "T": t, "C": c})
+  peak = ev.loc[ev.groupby("API")["C"].idxmax()].set_index("API")
+  span = float(end.max() - t0)
+  df2 = pd.DataFrame({"API": apis[peak.index.values]}, columns=["API"])
+  df2["In-flight max"] = peak["C"].values
+  df2["At"] = pd.to_datetime(peak["T"].values).strftime('%H:%M:%S.%f').str[:-3]
+  df2["In-flight mean"] = np.bincount(codes, weights=(end - start).astype(float))[peak.index.values] / span
+  df2 = df2.round(3)
+
+  total_mean = (end - start).astype(float).sum() / span
+  print("\n,,Window (sec.),Threads (-M),Threads seen,Peak active threads,Peak in-flight,Mean in-flight,Achieved parallelism %")
+  print(",,{0},{1},{2},{3},{4},{5:.3f},{6:.2f}\n\n".format(step, threads, len(th), int(active_max.max()), int(inflight_max.max()),
+        total_mean, total_mean * 100.0 / threads))
   print(df1.to_csv(sep=",", index=False, encoding="utf-8"))
-
-
-# search and dispatch to respective handlers
+  print(df2.to_csv(sep=",", index=False, encoding="utf-8"))
+
+  if rampup:
+    # thread T<n> is started in batch (n - 1) // bat, t_w seconds after the previous batch
+    num = pd.to_numeric(pd.Series(th.index, index=th.index).str.extract(r'(\d+)$', expand=False), errors="coerce")
+    rp = pd.DataFrame({"BATCH": (num - 1) // bat, "FIRST": (th["S_NS"] - t0) / float(ns)}).dropna()
+    rp = rp.groupby("BATCH").agg({"FIRST": ["count", "min"]})
+    rp.columns = ["Threads", "Actual start (sec.)"]
+    rp["Expected start (sec.)"] = rp.index.values * t_w
+    rp["Lag (sec.)"] = rp["Actual start (sec.)"] - rp["Expected start (sec.)"]
+    rp.index = (rp.index + 1).astype(int)
+    rp.index.name = "Batch"
+    print(rp[["Threads", "Expected start (sec.)", "Actual start (sec.)", "Lag (sec.)"]].round(3).to_csv(sep=",", encoding="utf-8"))
+
+
+def profile(df, key):
+  '''
+  per key count, mean, p90, p99, TPS and error rate of a log, the metrics compared by scenario 107.
+  '''
+  df = df.assign(PASS=pass_flag(df["STA_CODE"]))
+  g = df.groupby(key)
+  agg = g.agg({"DUR": ["count", "mean"], "PASS": ["sum"], "S_TIME": ["min"], "E_TIME": ["max"]})
+  elapsed = (agg[("E_TIME", "max")] - agg[("S_TIME", "min")]) / np.timedelta64(1, 's')
+  ret = pd.DataFrame({"COUNT": agg[("DUR", "count")], "MEAN": agg[("DUR", "mean")]})
+  pct = group_quantile(g, df["DUR"].values, [0.9, 0.99])
+  ret["P90"] = pct[0.9]
+  ret["P99"] = pct[0.99]
+  ret["TPS"] = ret["COUNT"] / elapsed
+  ret["ERR"] = (ret["COUNT"] - agg[("PASS", "sum")]) * 100.0 / ret["COUNT"]
+  return ret
+
+def mann_whitney(base, cand, key):
+  '''
+  per key two sided p-value of Mann-Whitney U test of DUR of candidate against baseline, by normal approximation with tie
+  correction, and whether candidate ranks slower. ranks come from one groupby rank of both logs.
+  '''
+  df = pd.concat([base[[key, "DUR"]].assign(CAND=0), cand[[key, "DUR"]].assign(CAND=1)], ignore_index=True)
+  df["RANK"] = df.groupby(key)["DUR"].rank()
+  ties = df.groupby([key, "DUR"]).size()
+  ties = (ties ** 3 - ties).groupby(level=key).sum()
+  g = df.groupby(key)
+  n = g.size().astype(float)
+  n2 = g["CAND"].sum().astype(float)
+  n1 = n - n2
+  u = df["RANK"].where(df["CAND"] == 1, 0).groupby(df[key]).sum() - n2 * (n2 + 1) / 2
+  mu = n1 * n2 / 2
+  sigma = np.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+  z = (np.abs(u - mu) - 0.5) / sigma
+  p = z.clip(lower=0).apply(lambda x: math.erfc(x / math.sqrt(2)) if x == x else np.nan)
+  return p, u > mu
+
+def stats_107(param_list, in_file):
+  '''
+  compare candidate log (1st param) with baseline in_file per API (or URL): deltas of mean, p90, p99, TPS and error rate, and a
+  Mann-Whitney test of response time. a key is regressed if mean, p90 or p99 is up or TPS down by more than threshold % and
+  response time is significantly slower, or error rate is up by more than error threshold points. exits with 3 on regression.
+  '''
+  if len(param_list) == 0 or not os.path.isfile(param_list[0]):
+    print("Candidate log is required for scenario 107, run program with -S option to see respective parameters.")
+    sys.exit(2)
+  cand_file = param_list[0]
+  threshold = float(param_list[1]) if len(param_list) > 1 and param_list[1] else 10.0
+  err_threshold = float(param_list[2]) if len(param_list) > 2 and param_list[2] else 1.0
+  alpha = float(param_list[3]) if len(param_list) > 3 and param_list[3] else 0.05
+  key = param_list[4].upper() if len(param_list) > 4 and param_list[4].upper() in ["API", "URL"] else "API"
+
+  cols = ["S_TIME", "E_TIME", "DUR", "STA_CODE", key]
+  base = read_log(in_file, LOG_COLUMNS[:10], cols)
+  cand = read_log(cand_file, LOG_COLUMNS[:10], cols)
+  b = profile(base, key)
+  c = profile(cand, key)
+  p, slower = mann_whitney(base, cand, key)
+
+  df1 = b.join(c, how="outer", lsuffix="_B", rsuffix="_C").sort_index()
+  regress = pd.Series("", index=df1.index)
+  for m in ["MEAN", "P90", "P99", "TPS"]:
+    df1[m + "_D"] = (df1[m + "_C"] - df1[m + "_B"]) * 100.0 / df1[m + "_B"]
+    worse = df1[m + "_D"] < -threshold if m == "TPS" else (df1[m + "_D"] > threshold) & (p.reindex(df1.index) < alpha) & slower.reindex(df1.index)
+    regress += np.where(worse.fillna(False), m.lower() + " ", "")
+  df1["ERR_D"] = df1["ERR_C"] - df1["ERR_B"]
+  regress += np.where((df1["ERR_D"] > err_threshold).fillna(False), "error ", "")
+  regress = regress.str.strip()
+
+  out = pd.DataFrame({key: df1.index}, columns=[key])
+  headers = {"COUNT": "Count", "MEAN": "Ave.(sec.)", "P90": "90 Percentile", "P99": "99 Percentile", "TPS": "TPS", "ERR": "Error %"}
+  for m in ["COUNT", "MEAN", "P90", "P99", "TPS", "ERR"]:
+    out[headers[m] + " base"] = df1[m + "_B"].values
+    out[headers[m] + " cand."] = df1[m + "_C"].values
+    if m in ["MEAN", "P90", "P99", "TPS"]:
+      out[headers[m] + " delta %"] = df1[m + "_D"].values
+  out["Error % delta (points)"] = df1["ERR_D"].values
+  out["p-value"] = p.reindex(df1.index).values
+  out["Regression"] = np.where(df1["COUNT_B"].isnull(), "candidate only", np.where(df1["COUNT_C"].isnull(), "baseline only", regress.values))
+  out = out.round(6)
+
+  regressed = (regress != "").sum()
+  print("\n,,Baseline,Candidate,Threshold %,Error threshold (points),Significance level,Regressions")
+  print(",,{0},{1},{2:g},{3:g},{4:g},{5}\n\n".format(in_file, cand_file, threshold, err_threshold, alpha, regressed))
+  print(out.to_csv(sep=",", index=False, encoding="utf-8"))
+  if regressed:
+    sys.exit(3)
+
+
+# search and dispatch to scenarios which take their own params and run one at a time.
 def dispatcher(arg):
     switcher = {
-        '100': stats_100,
-        '101': stats_101,
-        '102': stats_102,
-        '103': stats_103,
-        '104': stats_104,
-        '999': stats_explore,
+        '105': stats_105,
+        '106': stats_106,
+        '107': stats_107,
     }
     handler_name = switcher.get(arg)
     return handler_name
@@ -393,7 +925,10 @@ def dispatcher(arg):
 # Define a main() function
 def main():
   ###############################
+  global CHUNK_ROWS, CACHE, APPROX
   S_flag = False
+  s_flag = False
+  follow_secs = 0
   fn = None
  
   if len(sys.argv) == 1:
@@ -402,7 +937,7 @@ def main():
 
   # parse command line options
   try:
-    opts, args = getopt.getopt(sys.argv[1:], "f:s:S")
+    opts, args = getopt.getopt(sys.argv[1:], "f:s:c:F:aNS")
   except getopt.GetoptError as err:
     # print help information and exit:
     logger.error(err)
@@ -417,8 +952,16 @@ def main():
         sys.exit(2)
     elif o == "-s":
       s_flag = True
-      sce_id = a
+      sce_ids = a.split(":")
       param_list = args[0:]
+    elif o == "-c":
+      CHUNK_ROWS = int(a)
+    elif o == "-F":
+      follow_secs = int(a)
+    elif o == "-a":
+      APPROX = True
+    elif o == "-N":
+      CACHE = False
     elif o == "-S":
       S_flag = True
     else:
@@ -429,10 +972,23 @@ def main():
     dump_sce()
     sys.exit()
 
+  if follow_secs and fn:
+    follow(fn, follow_secs)
+    sys.exit()
+
   if s_flag:
-    # call dispatcher to get respective handler
-    handler = dispatcher(sce_id)
-    handler(param_list, fn)
+    if len(sce_ids) == 1 and dispatcher(sce_ids[0]):
+      dispatcher(sce_ids[0])(param_list, fn)
+      sys.exit()
+    alone = [i for i in sce_ids if dispatcher(i)]
+    if alone:
+      print("Scenario {0} takes its own params and can't be combined with other scenarios.".format(':'.join(alone)))
+      sys.exit(2)
+    unknown = [i for i in sce_ids if i not in REPORTS]
+    if unknown:
+      print("Unsupported scenario: {0}, run program with -S option to see supported scenarios.".format(':'.join(unknown)))
+      sys.exit(2)
+    run_reports(sce_ids, param_list, fn)
 
 # This is the standard boilerplate that calls the main() function.
 if __name__ == '__main__':
@@ -0,0 +1,201 @@
+#!/usr/bin/python2.7 -tt
+
+# AUTHOR:       Gu Jian Min
+# DATE:         18/10/2026
+# PROGRAM:      stats_bench.py
+# PURPOSE:
+#               benchmark of stats.py analysis engine on synthetic performance testing logs, reporting rows per second.
+#
+# HISTORY:
+#       version 1.0     18/10/2026              --- program initial
+#
+
+import sys
+import os
+import time
+import json
+import getopt
+import tempfile
+import shutil
+import numpy as np
+import pandas as pd
+import stats
+
+# global variables
+version = 'v1.0'
+CHUNK = 1000000  # rows generated per chunk
+THREADS = 100
+APIS = 20
+RUN_START = 8 * 3600  # 08:00:00, seconds of the day
+
+
+def usage(arg):
+  out_string = '''
+Benchmark of stats.py analysis engine on synthetic performance testing logs.
+
+Usage 1: {0} [-n rows] [-t fmt] [-k dir] [-R]
+
+where
+         -n: colon separated list of log sizes in rows, default to 1000000:10000000.
+         -t: log format, one of text, bin, or both delimited by ":", default to text:bin.
+         -k: keep generated logs in hereafter dir (created if absent) instead of a temporary directory, a log already there is reused.
+         -R: also time the legacy row-wise apply classification on the first 200000 rows, for comparison.
+
+Note: output is csv of rows, format, phase, seconds and rows per second. Phases are load (read_log), classify (pass_flag)
+      and summarise (per API statistics as of scenario 100). load always parses the log, the cache of stats.py (in_file.npz)
+      is disabled so that a log kept by -k isn't loaded from cache on later runs.
+
+'''.format(arg)
+  print(out_string)
+
+
+def synthetic_chunk(rng, n, offset):
+  '''
+  n rows of stats columns, request start times spread over THREADS threads from RUN_START onwards.
+  '''
+  start = RUN_START + (offset + np.arange(n)) * (7200.0 / 10000000) + rng.random_sample(n) * 0.01
+  dur = rng.lognormal(-3.0, 1.0, n)
+  status = rng.choice([200, 200, 200, 201, 304, 404, 500], n)
+  return {
+    "THREAD": rng.randint(1, THREADS + 1, n),
+    "S_TIME": start,
+    "E_TIME": start + dur,
+    "DUR": dur,
+    "BANDWIDTH": rng.randint(100, 100000, n),
+    "STA_CODE": status,
+    "API": rng.randint(0, APIS, n),
+  }
+
+
+def time_strings(t):
+  '''
+  seconds of the day to HH:MM:SS.mmm, via lookup tables to keep generation of 10M rows affordable.
+  '''
+  secs = np.array(['{0:02d}:{1:02d}:{2:02d}.'.format(s // 3600, s // 60 % 60, s % 60) for s in range(86400)], dtype=object)
+  msecs = np.array(['{0:03d}'.format(m) for m in range(1000)], dtype=object)
+  whole = t.astype(np.int64)
+  return secs[whole % 86400] + msecs[((t - whole) * 1000).astype(np.int64)]
+
+
+def gen_text(file, rows, rng):
+  apis = np.array(['C{0:02d}'.format(i) for i in range(APIS)], dtype=object)
+  threads = np.array(['T{0:02d}'.format(i) for i in range(THREADS + 1)], dtype=object)
+  with open(file, 'w') as fh:
+    for offset in range(0, rows, CHUNK):
+      c = synthetic_chunk(rng, min(CHUNK, rows - offset), offset)
+      df = pd.DataFrame({"THREAD": threads[c["THREAD"]], "S_TIME": time_strings(c["S_TIME"]), "E_TIME": time_strings(c["E_TIME"]),
+                         "DUR": c["DUR"], "BANDWIDTH": c["BANDWIDTH"], "STA_CODE": c["STA_CODE"], "API": apis[c["API"]]})
+      df["AP"] = "N"
+      df["URL"] = df["API"]
+      df["PARAM"] = "--"
+      df.to_csv(fh, header=False, index=False, float_format='%.6f', columns=stats.LOG_COLUMNS[:10])
+
+
+def gen_bin(file, rows, rng):
+  magic = 'STATSB02'
+  dtype = stats.BIN_DTYPES[magic]
+  # string ids: threads T01.., APIs C00.., then "N" and "" for AP and PARAM.
+  strs = ['T{0:02d}'.format(i) for i in range(1, THREADS + 1)] + ['C{0:02d}'.format(i) for i in range(APIS)] + ['N', '']
+  day = int(time.mktime(time.strptime(time.strftime('%Y%m%d'), '%Y%m%d')))
+  with open(file + '.str', 'w') as fh:
+    for i, s in enumerate(strs):
+      fh.write(json.dumps([i, s]) + '\n')
+  with open(file, 'wb') as fh:
+    fh.write(magic)
+    for offset in range(0, rows, CHUNK):
+      c = synthetic_chunk(rng, min(CHUNK, rows - offset), offset)
+      rec = np.zeros(len(c["DUR"]), dtype=dtype)
+      rec["S_TIME"] = ((day + c["S_TIME"]) * 1e9).astype(np.int64)
+      rec["E_TIME"] = ((day + c["E_TIME"]) * 1e9).astype(np.int64)
+      rec["DUR"] = c["DUR"]
+      rec["BANDWIDTH"] = c["BANDWIDTH"]
+      rec["STA_CODE"] = c["STA_CODE"]
+      rec["THREAD"] = c["THREAD"] - 1
+      rec["API"] = rec["URL"] = THREADS + c["API"]
+      rec["AP"] = THREADS + APIS
+      rec["PARAM"] = THREADS + APIS + 1
+      rec["TTFB"] = rec["BODY"] = np.nan
+      rec.tofile(fh)
+
+
+def report(rows, fmt, phase, secs):
+  print('{0},{1},{2},{3:.3f},{4:.0f}'.format(rows, fmt, phase, secs, rows / secs if secs > 0 else float('inf')))
+
+
+def bench(file, rows, fmt, legacy):
+  names = ["THREAD", "S_TIME", "E_TIME", "DUR", "BANDWIDTH", "STA_CODE", "API"]
+
+  start = time.time()
+  df = stats.read_log(file, names, names)
+  report(rows, fmt, 'load', time.time() - start)
+
+  if legacy:
+    sub = df.iloc[:200000]
+    start = time.time()
+    sub.apply(lambda row: 1 if row["STA_CODE"] <= 202 or row["STA_CODE"] == 304 else 0, axis=1)
+    report(len(sub), fmt, 'classify (row-wise apply)', time.time() - start)
+
+  start = time.time()
+  df["PASS"] = stats.pass_flag(df["STA_CODE"])
+  report(rows, fmt, 'classify', time.time() - start)
+
+  start = time.time()
+  stats.summarise(df, ["API"], [90])
+  report(rows, fmt, 'summarise', time.time() - start)
+
+
+# Define a main() function
+def main():
+  ###############################
+  sizes = [1000000, 10000000]
+  fmts = ['text', 'bin']
+  keep = None
+  R_flag = False
+
+  # parse command line options
+  try:
+    opts, args = getopt.getopt(sys.argv[1:], "n:t:k:Rhv")
+  except getopt.GetoptError as err:
+    print(err)
+    usage(os.path.basename(sys.argv[0]))
+    sys.exit(2)
+  for o, a in opts:
+    if o == "-n":
+      sizes = [int(n) for n in a.split(":")]
+    elif o == "-t":
+      fmts = a.split(":")
+    elif o == "-k":
+      keep = a
+    elif o == "-R":
+      R_flag = True
+    elif o == "-v":
+      print('{0} version: {1}'.format(os.path.basename(sys.argv[0]), version))
+      sys.exit(0)
+    elif o == "-h":
+      usage(os.path.basename(sys.argv[0]))
+      sys.exit()
+    else:
+      assert False, "unhandled option"
+      sys.exit(1)
+
+  stats.CACHE = False # time the parse, not a load of the cache written by the previous run
+  work_dir = keep or tempfile.mkdtemp(prefix='stats_bench.')
+  if not os.path.isdir(work_dir):
+    os.makedirs(work_dir)
+  try:
+    print('rows,format,phase,seconds,rows/sec.')
+    for rows in sizes:
+      for fmt in fmts:
+        file = os.path.join(work_dir, 'bench_{0}.{1}'.format(rows, 'bin' if fmt == 'bin' else 'log'))
+        if not os.path.isfile(file):
+          start = time.time()
+          (gen_bin if fmt == 'bin' else gen_text)(file, rows, np.random.RandomState(rows))
+          report(rows, fmt, 'generate', time.time() - start)
+        bench(file, rows, fmt, R_flag)
+  finally:
+    if not keep:
+      shutil.rmtree(work_dir)
+
+# This is the standard boilerplate that calls the main() function.
+if __name__ == '__main__':
+  main()